@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSV / TSV / JSON Lines 资源列表的批量导入
+
+用法:
+    python bulk_import.py curated_resources.csv
+    python bulk_import.py tools.tsv --resource-type web --chunksize 100000
+    python bulk_import.py export.jsonl.gz
+
+文件按块读取（pandas chunksize），每块走与read_2024_databases()相同的流程：
+分类、翻译、分配ID，然后边处理边写入目录文件，整个输入文件不会一次性载入内存。
+同一来源文件重复导入时，旧记录会被新记录替换。
+"""
+import argparse
+import os
+
+import pandas as pd
+
+import catalog_store
+from catalog_io import JsonArrayWriter, atomic_open
+from catalog_journal import (clear_journal, invalidate_store, load_catalog, mark_published, publish_pending,
+                             update_records)
+from dedup_index import POLICIES, DedupIndex, dedupe, report_dedupe
+from id_allocator import id_prefix, open_allocator
+from nar_batch import records_from_frame
+from read_2024_databases import UPDATED_CATEGORIES, translate_description
+from translation_memory import print_report
+
+CATALOG_FILE = 'databases_processed.json'
+DEFAULT_CHUNKSIZE = 50000
+
+# 常见列名到NAR标准列名的映射（不区分大小写）
+COLUMN_ALIASES = {
+    'database name': 'Database name',
+    'name': 'Database name',
+    'resource name': 'Database name',
+    'url': 'URL',
+    'link': 'URL',
+    'short description': 'Short description',
+    'short_description': 'Short description',
+    'description': 'Short description',
+}
+
+FORMAT_BY_EXTENSION = {
+    '.csv': 'csv',
+    '.tsv': 'tsv',
+    '.tab': 'tsv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+
+def detect_format(path):
+    """根据扩展名判断文件格式（忽略.gz/.bz2/.xz/.zip压缩后缀）"""
+    base, extension = os.path.splitext(path.lower())
+    if extension in ('.gz', '.bz2', '.xz', '.zip'):
+        extension = os.path.splitext(base)[1]
+    if extension not in FORMAT_BY_EXTENSION:
+        raise ValueError(f"无法识别的文件格式: {path}")
+    return FORMAT_BY_EXTENSION[extension]
+
+
+def normalize_columns(frame):
+    """把列名统一为NAR标准列名，已有标准列时不覆盖"""
+    renames = {}
+    targets = set(frame.columns)
+    for column in frame.columns:
+        target = COLUMN_ALIASES.get(str(column).strip().lower())
+        if target and target not in targets:
+            renames[column] = target
+            targets.add(target)
+    return frame.rename(columns=renames)
+
+
+def iter_chunks(path, file_format=None, chunksize=DEFAULT_CHUNKSIZE):
+    """按块读取CSV/TSV/JSONL文件，每次生成一个列名已统一的DataFrame"""
+    file_format = file_format or detect_format(path)
+    if file_format in ('csv', 'tsv'):
+        separator = '\t' if file_format == 'tsv' else ','
+        reader = pd.read_csv(path, sep=separator, dtype=str, chunksize=chunksize)
+    elif file_format == 'jsonl':
+        reader = pd.read_json(path, lines=True, dtype=False, chunksize=chunksize)
+    else:
+        raise ValueError(f"不支持的文件格式: {file_format}")
+
+    with reader:
+        for chunk in reader:
+            yield normalize_columns(chunk)
+
+
+def import_file(path, file_format=None, catalog_file=CATALOG_FILE, chunksize=DEFAULT_CHUNKSIZE,
+                data_type='database', resource_type='database', split_name=False, policy='skip'):
+    """
+    按块导入一个资源列表文件并写入目录，返回新增记录数
+
+    与目录中其它来源的记录（或本文件中先出现的记录）名称或URL相同的记录按policy
+    跳过或更新已有记录（见dedup_index）。已有记录在流式写出时已经写入，
+    它们的更新在目录写完后追加到操作日志，并随即发布到目录JSON。
+    """
+    existing_data = load_catalog(catalog_file)
+
+    source_file = os.path.basename(path)
+    kept = [item for item in existing_data if item.get('source_file') != source_file]
+    replaced_ids = {item.get('name'): item['id'] for item in existing_data if item.get('source_file') == source_file}
+    print(f"现有数据数量: {len(existing_data)}（其中来自{source_file}的{len(existing_data) - len(kept)}条将被替换）")
+
+    allocator = open_allocator(kept, catalog_file)
+    imported = 0
+    all_updates, skipped_sample, skipped_count = [], [], 0
+
+    # 数据库和JSON同步更新：旧记录删除，新记录按块插入
+    conn = invalidate_store(catalog_file)
+    catalog_store.delete_source_file(conn, source_file)
+
+    def lookup(record_id):
+        # 已经写出的新记录只在upsert命中时才从库中读回
+        found = catalog_store.find_by_id(conn, record_id)
+        return found[0] if len(found) == 1 else None
+
+    index = DedupIndex(kept, lookup)
+
+    with atomic_open(catalog_file) as f:
+        writer = JsonArrayWriter(f)
+        for item in kept:
+            writer.write(item)
+
+        for chunk in iter_chunks(path, file_format, chunksize):
+            records = records_from_frame(
+                chunk, 0,
+                UPDATED_CATEGORIES, translate_description,
+                data_type=data_type, resource_type=resource_type, split_name=split_name,
+                dictionary='extended'
+            )
+            records, updates, skipped = dedupe(records, index, policy)
+            all_updates.extend((existing['id'], fields) for existing, fields in updates)
+            skipped_sample.extend(skipped[:10 - len(skipped_sample)])
+            skipped_count += len(skipped)
+            for record in records:
+                record_id = replaced_ids.get(record['name'])
+                if record_id is None or not allocator.add(record_id):
+                    record_id = allocator.next_id(id_prefix(resource_type))
+                record['id'] = record_id
+                record['source_file'] = source_file
+                writer.write(record)
+            catalog_store.insert_records(conn, records)
+            # 写出后索引只保留键和ID，块中的记录可以释放
+            index.release(records)
+            imported += len(records)
+            print(f"  已处理 {imported} 条")
+
+        writer.close()
+    # 目录已整体重写，日志中的操作已经包含在内
+    clear_journal(catalog_file)
+    mark_published(catalog_file)
+    update_records(all_updates, catalog_file)
+    publish_pending(catalog_file)
+
+    report_dedupe(imported, all_updates, skipped_sample, policy, skipped_count)
+    print(f"\n成功导入 {imported} 条记录")
+    print(f"总资源数量: {len(kept) + imported}")
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按块导入CSV/TSV/JSONL资源列表')
+    parser.add_argument('files', nargs='+', help='要导入的文件')
+    parser.add_argument('--format', choices=['csv', 'tsv', 'jsonl'], default=None,
+                        help='文件格式（默认按扩展名判断）')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f'每块行数（默认: {DEFAULT_CHUNKSIZE}）')
+    parser.add_argument('--resource-type', choices=['database', 'web'], default='database',
+                        help='资源类型（默认: database）')
+    parser.add_argument('--split-name', action='store_true',
+                        help='按{A}:{B}格式拆分名称列')
+    parser.add_argument('--output', default=CATALOG_FILE,
+                        help='目录文件（默认: databases_processed.json）')
+    parser.add_argument('--on-duplicate', choices=POLICIES, default='skip',
+                        help='名称或URL已存在时跳过新记录或更新已有记录（默认: skip）')
+    args = parser.parse_args()
+
+    for path in args.files:
+        print(f"导入 {path}:")
+        import_file(path, args.format, args.output, args.chunksize,
+                    data_type=args.resource_type, resource_type=args.resource_type,
+                    split_name=args.split_name, policy=args.on_duplicate)
+    print_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录JSON的原子写入
+
+先写入同目录下的临时文件并fsync，再用os.replace原子替换目标文件，
+写到一半崩溃也不会留下损坏的databases_processed.json。
+发布给网站的是紧凑格式（无缩进），另可输出一份便于阅读的格式化副本。
+"""
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+CATALOG_FILE = 'databases_processed.json'
+PRETTY_FILE = 'databases_processed.pretty.json'
+
+COMPACT_SEPARATORS = (',', ':')
+
+
+def _fsync_directory(directory):
+    """把目录项的变化（rename）落盘；不支持的平台上忽略"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(path, encoding='utf-8', binary=False):
+    """以原子方式写文件：with块正常结束才替换目标文件，出错时目标保持不变"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding=encoding)) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp创建的文件权限是0600，网站需要可读
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+        _fsync_directory(directory)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def dumps(data, pretty=False):
+    """序列化为JSON字符串：紧凑格式或indent=2的格式化格式"""
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    return json.dumps(data, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+
+
+def write_json_atomic(path, data, pretty=False):
+    """原子写入JSON文件，返回写入的字节数"""
+    text = dumps(data, pretty)
+    with atomic_open(path) as f:
+        f.write(text)
+    return len(text.encode('utf-8'))
+
+
+class JsonArrayWriter:
+    """逐条写出JSON数组，格式与dumps(list, pretty)一致"""
+
+    def __init__(self, f, pretty=False):
+        self.f = f
+        self.pretty = pretty
+        self.count = 0
+        self.f.write('[')
+
+    def write(self, item):
+        if self.pretty:
+            text = json.dumps(item, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+            self.f.write(('\n  ' if self.count == 0 else ',\n  ') + text)
+        else:
+            text = json.dumps(item, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+            self.f.write(text if self.count == 0 else ',' + text)
+        self.count += 1
+
+    def close(self):
+        self.f.write('\n]' if self.pretty and self.count else ']')
+
+
+def report_savings(compact_bytes, pretty_bytes):
+    """打印紧凑格式相对格式化格式节省的字节数"""
+    saved = pretty_bytes - compact_bytes
+    ratio = saved / pretty_bytes * 100 if pretty_bytes else 0
+    print(f"紧凑格式 {compact_bytes:,} 字节，格式化格式 {pretty_bytes:,} 字节，"
+          f"节省 {saved:,} 字节 ({ratio:.1f}%)")
+
+
+def publish_catalog(records, catalog_file=CATALOG_FILE, pretty_file=None):
+    """
+    发布目录：原子写入紧凑格式的catalog_file，可选写入格式化副本pretty_file
+
+    返回 (紧凑字节数, 格式化字节数)。
+    """
+    compact_bytes = write_json_atomic(catalog_file, records)
+    if pretty_file:
+        pretty_bytes = write_json_atomic(pretty_file, records, pretty=True)
+    else:
+        pretty_bytes = len(dumps(records, pretty=True).encode('utf-8'))
+    report_savings(compact_bytes, pretty_bytes)
+    return compact_bytes, pretty_bytes
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录的追加式操作日志
+
+新增、修改、删除资源时不再读入并重写整个databases_processed.json，
+而是在 databases_processed.journal.jsonl 末尾追加一行操作记录（O(1)）。
+SQLite库 databases_processed.db（见catalog_store.py）是目录的权威数据，
+始终等于 已发布的JSON + 日志中的操作：每次追加日志后同一批操作也写入数据库，
+读取目录直接从数据库读。压缩（compact）从数据库导出JSON并清空日志。
+
+databases_processed.json 是网站实际发布的文件，日志和数据库都不进版本库：
+写目录的脚本在结束时调用 publish_pending()，把本次的操作发布到JSON；
+脚本内部连续追加时由 compact_if_needed() 按阈值压缩，控制日志长度。
+
+用法:
+    python catalog_journal.py status     # 查看日志中待发布的操作数
+    python catalog_journal.py compact    # 把日志合并进databases_processed.json
+    python catalog_journal.py compact --pretty   # 同时输出格式化副本
+"""
+import json
+import os
+import sys
+
+import catalog_store
+from catalog_io import PRETTY_FILE, publish_catalog
+from workbook_manifest import file_sha256
+
+CATALOG_FILE = 'databases_processed.json'
+
+# 日志中的操作数达到这个值时自动压缩
+COMPACT_THRESHOLD = 1000
+
+
+def journal_path(catalog_file=CATALOG_FILE):
+    """目录文件对应的日志文件路径"""
+    return os.path.splitext(catalog_file)[0] + '.journal.jsonl'
+
+
+def store_path(catalog_file=CATALOG_FILE):
+    """目录文件对应的SQLite库路径"""
+    return os.path.splitext(catalog_file)[0] + '.db'
+
+
+def _published_sha256(catalog_file):
+    return file_sha256(catalog_file) if os.path.exists(catalog_file) else ''
+
+
+def _file_stat(path):
+    """文件的修改时间和大小（不存在时为空串），用于不读内容地判断文件是否变化"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return ''
+    return f'{stat.st_mtime_ns}:{stat.st_size}'
+
+
+_stores = {}
+
+
+def _connect(catalog_file):
+    """每个库只打开一次连接"""
+    path = store_path(catalog_file)
+    if path not in _stores:
+        _stores[path] = catalog_store.open_store(path)
+    return _stores[path]
+
+
+def rebuild_store(catalog_file=CATALOG_FILE):
+    """用 已发布的JSON + 日志 重建SQLite库，并记录对应的发布状态"""
+    conn = _connect(catalog_file)
+    published_sha256 = _published_sha256(catalog_file)
+    ops = read_ops(catalog_file)
+    records = apply_ops(load_published(catalog_file), ops)
+    catalog_store.replace_all(conn, records, meta={
+        'published_sha256': published_sha256,
+        'published_stat': _file_stat(catalog_file),
+        'journal_ops': str(len(ops)),
+        'journal_stat': _file_stat(journal_path(catalog_file)),
+    })
+    print(f"已从 {catalog_file} 和日志重建 {store_path(catalog_file)}（{len(records)} 条记录）")
+    return conn
+
+
+def open_catalog_store(catalog_file=CATALOG_FILE):
+    """
+    打开目录对应的SQLite库
+
+    库中记录着它对应的已发布JSON的哈希和已应用的日志操作数，以及当时两个文件的
+    修改时间和大小。修改时间和大小都没变时直接使用库，不计算哈希也不解析日志；
+    变了才比较哈希和日志操作数，不一致时（首次使用、JSON被外部替换、
+    追加日志后写库前中断）用 已发布的JSON + 日志 重建。
+    """
+    conn = _connect(catalog_file)
+    published_stat = _file_stat(catalog_file)
+    journal_stat = _file_stat(journal_path(catalog_file))
+    if (catalog_store.get_meta(conn, 'published_stat') == published_stat
+            and catalog_store.get_meta(conn, 'journal_stat') == journal_stat):
+        return conn
+
+    if (catalog_store.get_meta(conn, 'published_sha256') != _published_sha256(catalog_file)
+            or catalog_store.get_meta(conn, 'journal_ops') != str(len(read_ops(catalog_file)))):
+        rebuild_store(catalog_file)
+    else:
+        # 内容没变（例如文件被touch过），只记下新的修改时间
+        with conn:
+            catalog_store.set_meta(conn, 'published_stat', published_stat)
+            catalog_store.set_meta(conn, 'journal_stat', journal_stat)
+    return conn
+
+
+def append_ops(ops, catalog_file=CATALOG_FILE):
+    """把操作逐行追加到日志末尾，并在同一批次中写入SQLite库"""
+    ops = list(ops)
+    if not ops:
+        return 0
+    conn = open_catalog_store(catalog_file)
+    # 先让日志落盘；写库前中断时，下次打开会按日志重建
+    with open(journal_path(catalog_file), 'a', encoding='utf-8') as f:
+        for op in ops:
+            f.write(json.dumps(op, ensure_ascii=False, separators=(',', ':')) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    journal_ops = int(catalog_store.get_meta(conn, 'journal_ops', '0')) + len(ops)
+    catalog_store.apply_ops(conn, ops, meta={
+        'journal_ops': str(journal_ops),
+        'journal_stat': _file_stat(journal_path(catalog_file)),
+    })
+    return len(ops)
+
+
+def add_records(records, catalog_file=CATALOG_FILE):
+    """追加新增记录"""
+    return append_ops(({'op': 'add', 'record': record} for record in records), catalog_file)
+
+
+def update_record(record_id, fields, catalog_file=CATALOG_FILE):
+    """追加一条修改操作：把fields合并进id为record_id的记录"""
+    return append_ops([{'op': 'update', 'id': record_id, 'fields': fields}], catalog_file)
+
+
+def update_records(updates, catalog_file=CATALOG_FILE):
+    """批量追加修改操作，updates为(record_id, fields)序列"""
+    return append_ops(
+        ({'op': 'update', 'id': record_id, 'fields': fields} for record_id, fields in updates),
+        catalog_file
+    )
+
+
+def delete_record(record_id, catalog_file=CATALOG_FILE):
+    """追加一条删除操作"""
+    return append_ops([{'op': 'delete', 'id': record_id}], catalog_file)
+
+
+def read_ops(catalog_file=CATALOG_FILE):
+    """读取日志中的全部操作；写入中断留下的不完整末行会被忽略"""
+    path = journal_path(catalog_file)
+    if not os.path.exists(path):
+        return []
+
+    ops = []
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            ops.append(json.loads(line))
+        except json.JSONDecodeError:
+            if number == len(lines):
+                print(f"警告: 忽略日志中不完整的最后一行（第{number}行）")
+                break
+            raise
+    return ops
+
+
+def apply_ops(records, ops):
+    """按顺序把操作应用到记录列表上，返回新的列表"""
+    records = list(records)
+    by_id = {}
+    for record in records:
+        by_id.setdefault(record.get('id'), []).append(record)
+
+    deleted = set()
+    for op in ops:
+        kind = op.get('op')
+        if kind == 'add':
+            record = op['record']
+            records.append(record)
+            by_id.setdefault(record.get('id'), []).append(record)
+        elif kind == 'update':
+            for record in by_id.get(op['id'], []):
+                record.update(op['fields'])
+        elif kind == 'delete':
+            for record in by_id.pop(op['id'], []):
+                deleted.add(id(record))
+        else:
+            raise ValueError(f"未知的日志操作: {kind}")
+
+    if deleted:
+        records = [record for record in records if id(record) not in deleted]
+    return records
+
+
+def load_published(catalog_file=CATALOG_FILE):
+    """只读取已发布的目录JSON"""
+    if not os.path.exists(catalog_file):
+        return []
+    with open(catalog_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_catalog(catalog_file=CATALOG_FILE):
+    """读取当前目录（= 已发布的JSON + 日志中尚未压缩的操作），从SQLite库读出"""
+    return catalog_store.load_records(open_catalog_store(catalog_file))
+
+
+def clear_journal(catalog_file=CATALOG_FILE):
+    """清空日志（目录已整体重写时调用）"""
+    path = journal_path(catalog_file)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def invalidate_store(catalog_file=CATALOG_FILE):
+    """即将在库外重写JSON时调用：中途失败的话，下次打开会重建SQLite库"""
+    conn = open_catalog_store(catalog_file)
+    with conn:
+        catalog_store.set_meta(conn, 'published_sha256', '')
+        catalog_store.set_meta(conn, 'published_stat', None)
+    return conn
+
+
+def mark_published(catalog_file=CATALOG_FILE):
+    """JSON已整体重写、日志已清空后，让SQLite库记住新的发布状态"""
+    conn = _connect(catalog_file)
+    with conn:
+        catalog_store.set_meta(conn, 'published_sha256', _published_sha256(catalog_file))
+        catalog_store.set_meta(conn, 'published_stat', _file_stat(catalog_file))
+        catalog_store.set_meta(conn, 'journal_ops', '0')
+        catalog_store.set_meta(conn, 'journal_stat', _file_stat(journal_path(catalog_file)))
+
+
+def write_catalog(records, catalog_file=CATALOG_FILE, pretty_file=None):
+    """写入SQLite库，再原子导出目录JSON（紧凑格式，可选格式化副本）并清空日志"""
+    conn = open_catalog_store(catalog_file)
+    catalog_store.replace_all(conn, records)
+    publish_catalog(records, catalog_file, pretty_file)
+    clear_journal(catalog_file)
+    mark_published(catalog_file)
+
+
+def compact(catalog_file=CATALOG_FILE, pretty_file=None):
+    """把日志合并进已发布的目录JSON"""
+    ops = read_ops(catalog_file)
+    if not ops:
+        print("日志为空，无需压缩")
+        return load_published(catalog_file)
+
+    records = catalog_store.load_records(open_catalog_store(catalog_file))
+    publish_catalog(records, catalog_file, pretty_file)
+    clear_journal(catalog_file)
+    mark_published(catalog_file)
+    print(f"已把 {len(ops)} 条日志操作合并进 {catalog_file}，共 {len(records)} 条记录")
+    return records
+
+
+def compact_if_needed(catalog_file=CATALOG_FILE, threshold=COMPACT_THRESHOLD):
+    """日志操作数（库中的计数）达到阈值时压缩"""
+    conn = open_catalog_store(catalog_file)
+    if int(catalog_store.get_meta(conn, 'journal_ops', '0')) >= threshold:
+        return compact(catalog_file)
+    return None
+
+
+def publish_pending(catalog_file=CATALOG_FILE):
+    """
+    脚本结束时调用：日志中有操作就压缩，保证发布的目录JSON包含本次写入
+
+    日志为空时不读取也不重写目录文件，返回None。
+    """
+    return compact_if_needed(catalog_file, threshold=1)
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'compact':
+        compact(pretty_file=PRETTY_FILE if '--pretty' in sys.argv[2:] else None)
+    elif command == 'status':
+        ops = read_ops()
+        counts = {}
+        for op in ops:
+            counts[op.get('op')] = counts.get(op.get('op'), 0) + 1
+        print(f"{journal_path()}: {len(ops)} 条待发布操作 {counts}")
+    else:
+        print(f"未知命令: {command}（可用: status, compact）")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基于SQLite的资源目录存储
+
+每条资源的完整记录以JSON保存在data列中，常用查询字段单独成列并建索引：
+规范化名称、URL、分类、资源类型、来源文件；另建FTS5全文索引覆盖名称和中英文描述。
+目录的权威数据在这里，网站使用的databases_processed.json由它导出。
+导入和导出都经过操作日志（见catalog_journal.py），库中记录的发布状态与文件保持一致。
+
+用法:
+    python catalog_store.py import      # 从databases_processed.json和日志重建数据库
+    python catalog_store.py export      # 把日志合并进databases_processed.json
+    python catalog_store.py search 关键词
+"""
+import json
+import re
+import sqlite3
+import sys
+import unicodedata
+
+
+STORE_FILE = 'databases_processed.db'
+CATALOG_FILE = 'databases_processed.json'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    pk INTEGER PRIMARY KEY,
+    id,
+    name TEXT,
+    name_norm TEXT,
+    url TEXT,
+    category TEXT,
+    resource_type TEXT,
+    source_file TEXT,
+    short_description TEXT,
+    short_description_zh TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resources_id ON resources(id);
+CREATE INDEX IF NOT EXISTS idx_resources_name_norm ON resources(name_norm);
+CREATE INDEX IF NOT EXISTS idx_resources_url ON resources(url);
+CREATE INDEX IF NOT EXISTS idx_resources_category ON resources(category);
+CREATE INDEX IF NOT EXISTS idx_resources_resource_type ON resources(resource_type);
+CREATE INDEX IF NOT EXISTS idx_resources_source_file ON resources(source_file);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5(
+    name, short_description, short_description_zh,
+    content='resources', content_rowid='pk'
+);
+CREATE TRIGGER IF NOT EXISTS resources_ai AFTER INSERT ON resources BEGIN
+    INSERT INTO resources_fts(rowid, name, short_description, short_description_zh)
+    VALUES (new.pk, new.name, new.short_description, new.short_description_zh);
+END;
+CREATE TRIGGER IF NOT EXISTS resources_ad AFTER DELETE ON resources BEGIN
+    INSERT INTO resources_fts(resources_fts, rowid, name, short_description, short_description_zh)
+    VALUES ('delete', old.pk, old.name, old.short_description, old.short_description_zh);
+END;
+CREATE TRIGGER IF NOT EXISTS resources_au AFTER UPDATE ON resources BEGIN
+    INSERT INTO resources_fts(resources_fts, rowid, name, short_description, short_description_zh)
+    VALUES ('delete', old.pk, old.name, old.short_description, old.short_description_zh);
+    INSERT INTO resources_fts(rowid, name, short_description, short_description_zh)
+    VALUES (new.pk, new.name, new.short_description, new.short_description_zh);
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# 单独成列的字段（除规范化名称外都直接取自记录）
+INDEXED_FIELDS = ['id', 'name', 'url', 'category', 'resource_type', 'source_file',
+                  'short_description', 'short_description_zh']
+
+
+def normalize_name(name):
+    """规范化名称：NFKC、忽略大小写、合并空白"""
+    name = unicodedata.normalize('NFKC', str(name or ''))
+    return re.sub(r'\s+', ' ', name).strip().casefold()
+
+
+def open_store(path=STORE_FILE):
+    """打开（必要时创建）目录数据库"""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def get_meta(conn, key, default=None):
+    row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_meta(conn, key, value):
+    conn.execute('INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)', (key, value))
+
+
+def _row_values(record):
+    """记录 -> resources表的列值"""
+    values = [record.get(field) for field in INDEXED_FIELDS]
+    values.insert(2, normalize_name(record.get('name')))
+    values.append(json.dumps(record, ensure_ascii=False))
+    return values
+
+
+_INSERT_SQL = (
+    'INSERT INTO resources (id, name, name_norm, url, category, resource_type, source_file, '
+    'short_description, short_description_zh, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+)
+
+
+def _insert(conn, records):
+    conn.executemany(_INSERT_SQL, (_row_values(record) for record in records))
+
+
+def _update(conn, record_id, fields):
+    rows = conn.execute('SELECT pk, data FROM resources WHERE id = ?', (record_id,)).fetchall()
+    for pk, data in rows:
+        record = json.loads(data)
+        record.update(fields)
+        conn.execute(
+            'UPDATE resources SET id = ?, name = ?, name_norm = ?, url = ?, category = ?, '
+            'resource_type = ?, source_file = ?, short_description = ?, short_description_zh = ?, '
+            'data = ? WHERE pk = ?', _row_values(record) + [pk]
+        )
+    return len(rows)
+
+
+def _delete(conn, record_id):
+    return conn.execute('DELETE FROM resources WHERE id = ?', (record_id,)).rowcount
+
+
+def insert_records(conn, records):
+    """批量插入记录（保持插入顺序）"""
+    with conn:
+        _insert(conn, records)
+
+
+def update_record(conn, record_id, fields):
+    """把fields合并进id为record_id的所有记录，返回修改的条数"""
+    with conn:
+        return _update(conn, record_id, fields)
+
+
+def delete_record(conn, record_id):
+    """删除id为record_id的记录，返回删除的条数"""
+    with conn:
+        return _delete(conn, record_id)
+
+
+def delete_source_file(conn, source_file):
+    """删除来自source_file的全部记录，返回删除的条数"""
+    with conn:
+        return conn.execute('DELETE FROM resources WHERE source_file = ?', (source_file,)).rowcount
+
+
+def apply_ops(conn, ops, meta=None):
+    """在一个事务中把日志操作（add/update/delete）应用到数据库，meta随同一事务写入"""
+    with conn:
+        for key, value in (meta or {}).items():
+            set_meta(conn, key, value)
+        for op in ops:
+            kind = op.get('op')
+            if kind == 'add':
+                _insert(conn, [op['record']])
+            elif kind == 'update':
+                _update(conn, op['id'], op['fields'])
+            elif kind == 'delete':
+                _delete(conn, op['id'])
+            else:
+                raise ValueError(f"未知的日志操作: {kind}")
+
+
+def replace_all(conn, records, meta=None):
+    """用records整体替换数据库中的目录，meta随同一事务写入"""
+    with conn:
+        for key, value in (meta or {}).items():
+            set_meta(conn, key, value)
+        conn.execute('DELETE FROM resources')
+        _insert(conn, records)
+
+
+def _records(cursor):
+    return [json.loads(data) for (data,) in cursor]
+
+
+def load_records(conn):
+    """按插入顺序读取全部记录"""
+    return _records(conn.execute('SELECT data FROM resources ORDER BY pk'))
+
+
+def count_records(conn):
+    return conn.execute('SELECT COUNT(*) FROM resources').fetchone()[0]
+
+
+def find_by_id(conn, record_id):
+    return _records(conn.execute('SELECT data FROM resources WHERE id = ? ORDER BY pk', (record_id,)))
+
+
+def find_by_name(conn, name):
+    """按规范化名称查找（走索引）"""
+    return _records(conn.execute(
+        'SELECT data FROM resources WHERE name_norm = ? ORDER BY pk', (normalize_name(name),)))
+
+
+def find_by_url(conn, url):
+    return _records(conn.execute('SELECT data FROM resources WHERE url = ? ORDER BY pk', (url,)))
+
+
+def find_by_category(conn, category):
+    return _records(conn.execute('SELECT data FROM resources WHERE category = ? ORDER BY pk', (category,)))
+
+
+def find_by_source_file(conn, source_file):
+    return _records(conn.execute(
+        'SELECT data FROM resources WHERE source_file = ? ORDER BY pk', (source_file,)))
+
+
+def search(conn, query, limit=20):
+    """全文检索名称和中英文描述，按相关度排序"""
+    # 每个词加引号，避免用户输入中的-、:等被当作FTS语法
+    terms = ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+    if not terms:
+        return []
+    return _records(conn.execute(
+        'SELECT r.data FROM resources_fts f JOIN resources r ON r.pk = f.rowid '
+        'WHERE resources_fts MATCH ? ORDER BY f.rank LIMIT ?', (terms, limit)))
+
+
+def category_counts(conn):
+    """各分类的资源数"""
+    return dict(conn.execute('SELECT category, COUNT(*) FROM resources GROUP BY category'))
+
+
+def main():
+    # catalog_journal依赖本模块，只在命令行入口导入
+    import catalog_journal
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    if command == 'import':
+        conn = catalog_journal.rebuild_store(CATALOG_FILE)
+        print(f"已导入 {count_records(conn)} 条记录到 {STORE_FILE}")
+        return
+    if command == 'export':
+        records = catalog_journal.compact(CATALOG_FILE)
+        print(f"已导出 {len(records)} 条记录到 {CATALOG_FILE}")
+        return
+
+    conn = catalog_journal.open_catalog_store(CATALOG_FILE)
+    if command == 'search':
+        for record in search(conn, ' '.join(sys.argv[2:])):
+            print(f"  [{record.get('id')}] {record.get('name')}: {record.get('short_description')}")
+    elif command == 'stats':
+        print(f"{STORE_FILE}: {count_records(conn)} 条记录")
+        for category, count in sorted(category_counts(conn).items(), key=lambda item: -item[1]):
+            print(f"  {category}: {count}个")
+    else:
+        print(f"未知命令: {command}（可用: import, export, search, stats）")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,11 @@
 为数据库分类并添加中文翻译
 """
 import json
-import re
+
+from catalog_journal import write_catalog
+from keyword_matcher import categorize
+from text_tokens import tokenize, tokenize_record
+from translation_dictionaries import load_dictionary
 
 # 定义分类规则
 CATEGORIES = {
@@ -42,63 +46,33 @@ CATEGORIES = {
     }
 }
 
-# 简单的英中翻译字典
-TRANSLATIONS = {
-    'Asteraceae multi-omics information resource': '菊科多组学信息资源',
-    'Structures of human protein isoforms': '人类蛋白质异构体结构',
-    'Bio-Analytic Resource for Plant Biology': '植物生物学生物分析资源',
-    'AlphaFold-predicted structures of viral proteins': 'AlphaFold预测的病毒蛋白结构',
-    'Bacterial and Archaeal Gene Expression Database': '细菌和古菌基因表达数据库',
-    'database': '数据库',
-    'resource': '资源',
-    'tool': '工具',
-    'platform': '平台',
-    'analysis': '分析',
-    'information': '信息',
-    'structure': '结构',
-    'protein': '蛋白质',
-    'gene': '基因',
-    'genome': '基因组',
-    'plant': '植物',
-    'human': '人类',
-    'biological': '生物学',
-    'molecular': '分子',
-    'cellular': '细胞',
-    'genetic': '遗传',
-    'genomic': '基因组',
-    'transcriptomic': '转录组',
-    'proteomic': '蛋白质组',
-    'metabolomic': '代谢组'
-}
-
-def categorize_database(name, description):
+def categorize_database(name, description, tokens=None):
     """根据名称和描述给数据库分类"""
-    text = (name + ' ' + description).lower()
-    
-    for category_id, category_info in CATEGORIES.items():
-        for keyword in category_info['keywords']:
-            if keyword.lower() in text:
-                return category_id
-    
-    return 'tools'  # 默认分类
+    # 关键词表编译成Aho-Corasick自动机，一次扫描；结果与逐个关键词查找相同
+    return categorize(CATEGORIES, name, description, tokens=tokens)
 
-def translate_description(description):
+def translate_description(description, tokens=None):
     """简单翻译描述"""
+    # 词典见translations.json中的'basic'
+    translations = load_dictionary('basic')
+    
     # 先尝试直接翻译
-    if description in TRANSLATIONS:
-        return TRANSLATIONS[description]
+    if description in translations:
+        return translations[description]
     
-    # 逐词翻译
-    words = re.findall(r'\b\w+\b', description.lower())
+    # 逐词翻译（单词取自分词结果，不再另做一次re.findall）
+    if tokens is None:
+        tokens = tokenize(description)
+    words = tokens.words
     translated_words = []
     
     for word in words:
-        if word in TRANSLATIONS:
-            translated_words.append(TRANSLATIONS[word])
+        if word in translations:
+            translated_words.append(translations[word])
         else:
             translated_words.append(word)
     
-    if translated_words and any(word in TRANSLATIONS for word in words):
+    if translated_words and any(word in translations for word in words):
         return ' '.join(translated_words)
     
     # 如果没有找到翻译，返回原文
@@ -110,17 +84,19 @@ def process_databases():
         databases = json.load(f)
     
     for db in databases:
+        # 名称和描述只分词一次，分类和翻译共用
+        record_tokens, description_tokens = tokenize_record(db['name'], db['short_description'])
+        
         # 添加分类
-        category = categorize_database(db['name'], db['short_description'])
+        category = categorize_database(db['name'], db['short_description'], record_tokens)
         db['category'] = category
         db['category_name'] = CATEGORIES[category]['name']
         
         # 添加中文翻译
-        db['short_description_zh'] = translate_description(db['short_description'])
+        db['short_description_zh'] = translate_description(db['short_description'], description_tokens)
     
     # 保存处理后的数据
-    with open('databases_processed.json', 'w', encoding='utf-8') as f:
-        json.dump(databases, f, ensure_ascii=False, indent=2)
+    write_catalog(databases)
     
     # 统计分类
     category_stats = {}
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+写入目录时按名称和URL去重的哈希索引
+
+原来只有add_missing_3d_gnome.py在添加前检查名称是否已存在，其它脚本直接追加，
+databases_processed.json中已经有'e-RNA'、'GenomeFLTR'这样的重复名称，
+antiSMASH的URL出现了三次。这里对目录建立两个哈希索引：
+
+  - 规范化名称（NFKC、忽略大小写、合并空白，与catalog_store.normalize_name相同）；
+  - 规范化URL（见url_index.canonical_url，'nan'等视为没有URL）。
+
+每条新记录查一次索引（O(1)），名称或URL已存在时按策略处理：
+  - skip：跳过新记录（默认）；
+  - upsert：用新记录中非空的字段更新已有记录，保留已有记录的ID。
+    操作日志按ID修改记录，已有记录的ID在目录中不唯一时不做upsert（按skip处理），
+    以免改到同ID的其它记录；先用id_allocator.py重新编号。
+同一批新记录之间也会去重。新记录在查索引前先经过URL规范化阶段，
+写入目录时带上url_canonical字段。
+
+用法:
+    python dedup_index.py                  # 报告目录中已有的重复资源
+    python dedup_index.py --catalog bioinfo_resources_945.json
+"""
+import argparse
+import json
+from collections import Counter
+
+from catalog_journal import add_records, load_catalog, update_records
+from catalog_store import normalize_name
+from url_index import CANONICAL_FIELD, MISSING_VALUES, canonical_url, canonicalize_record, record_url
+
+CATALOG_FILE = 'databases_processed.json'
+POLICIES = ('skip', 'upsert')
+
+# upsert时不会被新记录覆盖的字段（ID和来源）
+PROTECTED_FIELDS = {'id', 'source_file', 'excel_row'}
+
+
+def name_key(record):
+    key = normalize_name(record.get('name'))
+    return key if key and key not in MISSING_VALUES else None
+
+
+def url_key(record):
+    return record_url(record)
+
+
+def has_value(value):
+    """字段是否有值（None、空串和'nan'等缺失值视为没有）"""
+    return value is not None and str(value).strip().lower() not in MISSING_VALUES
+
+
+class DedupIndex:
+    """
+    目录记录的规范化名称索引和规范化URL索引
+
+    索引的值是记录本身；流式导入时可以用release()把已经写出的新记录换成它们的ID，
+    索引只保留键和ID，内存不随输入增长。值为ID的记录在需要upsert时才通过
+    lookup(ID)取回完整记录（例如从SQLite库中读取）。
+    """
+
+    def __init__(self, records=(), lookup=None):
+        self.by_name = {}
+        self.by_url = {}
+        self.lookup = lookup
+        # 已有记录的ID计数（新记录的ID由id_allocator分配，不会重复）
+        self.id_counts = Counter()
+        for record in records:
+            if record.get('id') is not None:
+                self.id_counts[record['id']] += 1
+            self.add(record)
+
+    def add(self, record):
+        """登记一条记录（已登记的键保留第一条记录）"""
+        key = name_key(record)
+        if key is not None:
+            self.by_name.setdefault(key, record)
+        key = url_key(record)
+        if key is not None:
+            self.by_url.setdefault(key, record)
+
+    # upsert改了名称或URL后，新的键也指向这条记录
+    reindex = add
+
+    def release(self, records):
+        """把索引中指向这些记录的值换成记录的ID（记录已经写出、分配了ID之后调用）"""
+        for record in records:
+            for table, key in ((self.by_name, name_key(record)), (self.by_url, url_key(record))):
+                if key is not None and table.get(key) is record:
+                    table[key] = record['id']
+
+    def find_entry(self, record):
+        """返回名称或URL相同的已有记录或其ID，没有时返回None（名称优先）"""
+        key = name_key(record)
+        if key is not None and key in self.by_name:
+            return self.by_name[key]
+        key = url_key(record)
+        if key is not None and key in self.by_url:
+            return self.by_url[key]
+        return None
+
+    def resolve(self, entry):
+        """把find_entry()的结果换成完整记录（值为ID时通过lookup读取）"""
+        if entry is None or isinstance(entry, dict):
+            return entry
+        return self.lookup(entry) if self.lookup is not None else None
+
+    def find(self, record):
+        """返回名称或URL相同的已有记录，没有时返回None（名称优先）"""
+        return self.resolve(self.find_entry(record))
+
+    def ambiguous_id(self, record):
+        """记录的ID是否被多条已登记的记录共用"""
+        return self.id_counts[record.get('id')] > 1
+
+
+def upsert_fields(existing, record):
+    """新记录中与已有记录不同的非空字段（URL改变时url_canonical随之改变）"""
+    fields = {
+        field: value for field, value in record.items()
+        if field not in PROTECTED_FIELDS and has_value(value) and existing.get(field) != value
+    }
+    if 'url' in fields:
+        fields[CANONICAL_FIELD] = canonical_url(fields['url'])
+    elif CANONICAL_FIELD in fields:
+        del fields[CANONICAL_FIELD]
+    return fields
+
+
+def dedupe(records, index, policy='skip'):
+    """
+    用索引对新记录去重
+
+    返回 (added, updates, skipped)：added 为需要新增的记录，
+    updates 为upsert时对已有记录的修改 [(已有记录, 字段), ...]，skipped 为跳过的新记录。
+    每条新记录先写入url_canonical；新增的记录会登记到索引中，upsert的字段同时合并进已有记录。
+    已有记录的ID不唯一时不做upsert，新记录计入skipped。
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"未知的去重策略: {policy}（可用: {', '.join(POLICIES)}）")
+    added, updates, skipped = [], [], []
+    for record in records:
+        canonicalize_record(record)
+        entry = index.find_entry(record)
+        if entry is None:
+            index.add(record)
+            added.append(record)
+            continue
+        if policy == 'skip':
+            # skip只需要知道键已存在，不读取已有记录
+            skipped.append(record)
+            continue
+
+        existing = index.resolve(entry)
+        if existing is None:
+            skipped.append(record)
+        elif index.ambiguous_id(existing):
+            print(f"  ID {existing.get('id')} 不唯一，不更新 {existing.get('name')}（请先运行 id_allocator.py 重新编号）")
+            skipped.append(record)
+        else:
+            fields = upsert_fields(existing, record)
+            if fields:
+                existing.update(fields)
+                index.reindex(existing)
+                updates.append((existing, fields))
+    return added, updates, skipped
+
+
+def report_dedupe(added_count, updates, skipped, policy, skipped_count=None):
+    """打印去重结果；skipped可以只是跳过的记录中的一部分样本，这时用skipped_count给出总数"""
+    message = f"去重（{policy}）: 新增 {added_count} 条"
+    if policy == 'upsert':
+        message += f"，更新已有记录 {len(updates)} 条"
+    message += f"，跳过 {len(skipped) if skipped_count is None else skipped_count} 条"
+    print(message)
+    for record in skipped[:10]:
+        print(f"  跳过重复: {record.get('name')} ({record.get('url')})")
+
+
+def insert_records(records, existing_data=None, policy='skip', catalog_file=CATALOG_FILE):
+    """
+    经过去重索引把新记录写入目录（操作日志），返回实际新增的记录
+
+    existing_data 为已经加载的目录记录（省略时从目录加载）。
+    """
+    if existing_data is None:
+        existing_data = load_catalog(catalog_file)
+    added, updates, skipped = dedupe(records, DedupIndex(existing_data), policy)
+    add_records(added, catalog_file)
+    update_records(((existing['id'], fields) for existing, fields in updates), catalog_file)
+    report_dedupe(len(added), updates, skipped, policy)
+    return added
+
+
+def find_duplicate_groups(records):
+    """目录中已有的重复：返回 (按名称的分组, 按URL的分组)，每组为记录下标列表"""
+    by_name, by_url = {}, {}
+    for position, record in enumerate(records):
+        key = name_key(record)
+        if key is not None:
+            by_name.setdefault(key, []).append(position)
+        key = url_key(record)
+        if key is not None:
+            by_url.setdefault(key, []).append(position)
+    return ({key: group for key, group in by_name.items() if len(group) > 1},
+            {key: group for key, group in by_url.items() if len(group) > 1})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='报告目录中按名称和URL重复的资源')
+    parser.add_argument('--catalog', default=CATALOG_FILE, help='目录文件')
+    args = parser.parse_args()
+
+    if args.catalog == CATALOG_FILE:
+        records = load_catalog(args.catalog)
+    else:
+        with open(args.catalog, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        records = data['resources'] if isinstance(data, dict) else data
+
+    by_name, by_url = find_duplicate_groups(records)
+    print(f"{args.catalog}: {len(records)} 条记录")
+    print(f"名称重复: {len(by_name)} 组，{sum(len(group) - 1 for group in by_name.values())} 条多余记录")
+    for key, group in list(by_name.items())[:10]:
+        print(f"  {records[group[0]].get('name')}: ID {[records[position].get('id') for position in group]}")
+    print(f"URL重复: {len(by_url)} 组，{sum(len(group) - 1 for group in by_url.values())} 条多余记录")
+    for key, group in sorted(by_url.items(), key=lambda item: -len(item[1]))[:10]:
+        print(f"  {key}: {[records[position].get('name') for position in group]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,24 +3,26 @@
 """
 找出缺失的数据库
 """
-import pandas as pd
 import json
 
+from nar_ingest import check_row_range, print_row_range_report
+
 def find_missing_database():
     try:
-        # 读取Excel文件
-        df = pd.read_excel('nar2024databases.xlsx')
+        source_file = 'nar2024databases.xlsx'
         
-        print("Excel文件第92-186行的所有数据库:")
-        excel_databases = []
+        # read_96_new_databases.py提取的是df.iloc[91:187]，即Excel第93-187行
+        report = check_row_range(source_file, 93, 187, expected_count=95)
+        print_row_range_report(report)
         
-        # 提取第92-186行（索引91-185）
-        for i in range(91, 186):
-            db_name = df.iloc[i]['Database name']
+        print("\nExcel文件第93-187行的所有数据库:")
+        excel_databases = []
+        for row in report['rows']:
+            db_name = row['Database name']
             excel_databases.append(db_name)
-            print(f"第{i+1}行: {db_name}")
+            print(f"第{row['excel_row']}行: {db_name}")
         
-        print(f"\nExcel中第92-186行总数: {len(excel_databases)}")
+        print(f"\nExcel中第93-187行总数: {len(excel_databases)}")
         
         # 读取当前处理的数据
         with open('databases_processed.json', 'r', encoding='utf-8') as f:
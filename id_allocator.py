@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+资源ID的分配与唯一性索引
+
+原来各脚本用 len(existing_data) + 1 分配ID，而目录中的ID是 'database_081'、
+'web_004'、'new_db_43' 这样的"前缀_编号"格式，2024和2025年的工作簿又各自从1编号，
+945条记录只有604个不同的ID。这里：
+
+  - 扫描一遍目录建立ID哈希索引，并记下每个前缀已用到的最大编号；
+  - 新记录按资源类型取前缀（database_/web_），编号接着最大值往后分配，
+    查索引保证不与任何已有ID冲突，可以一次分配一批；
+  - 并行导入时给每个进程预留一段编号（IdRange），进程内直接使用，不需要协调；
+    不同进程之间的预留记录在目录数据库（databases_processed.db）的meta表中；
+  - 为已有快照中重复的ID重新编号：每个ID第一次出现的记录保留原ID，
+    之后出现的记录换成同前缀的新ID。
+
+全部操作对目录是线性时间。
+
+用法:
+    python id_allocator.py check databases_processed.json bioinfo_resources_945.json
+    python id_allocator.py rekey databases_processed.json --dry-run
+    python id_allocator.py rekey bioinfo_resources_945.json
+    python id_allocator.py reserve database 500          # 为独立的导入进程预留编号
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+CATALOG_FILE = 'databases_processed.json'
+CATEGORY_INDEX_FILE = 'category_index.json'
+
+# 资源类型 -> 新ID的前缀
+ID_PREFIXES = {'database': 'database', 'web': 'web'}
+DEFAULT_PREFIX = 'database'
+# 编号至少3位（与 database_081 一致）
+NUMBER_WIDTH = 3
+
+_ID_PATTERN = re.compile(r'^(.*?)_?(\d+)$')
+_HIGH_WATER_KEY = 'id_high_water:'
+
+
+def split_id(record_id):
+    """'database_081' -> ('database', 81)；整数ID的前缀为''；无法解析时编号为None"""
+    if isinstance(record_id, int):
+        return '', record_id
+    match = _ID_PATTERN.match(str(record_id))
+    if not match:
+        return str(record_id), None
+    return match.group(1), int(match.group(2))
+
+
+def format_id(prefix, number):
+    """('database', 476) -> 'database_476'；前缀为''时返回整数"""
+    if not prefix:
+        return number
+    return f"{prefix}_{number:0{NUMBER_WIDTH}d}"
+
+
+def id_prefix(resource_type):
+    """资源类型对应的ID前缀"""
+    return ID_PREFIXES.get(resource_type, DEFAULT_PREFIX)
+
+
+class IdRange:
+    """预留给一个导入进程的一段编号 [start, stop)，可以传给子进程独立使用"""
+
+    def __init__(self, prefix, start, stop):
+        self.prefix = prefix
+        self.start = start
+        self.stop = stop
+        self.next = start
+
+    def allocate(self, count=1):
+        if self.next + count > self.stop:
+            raise ValueError(f"预留的编号不足: {self.prefix} [{self.start}, {self.stop}) 还剩 {self.stop - self.next} 个")
+        ids = [format_id(self.prefix, number) for number in range(self.next, self.next + count)]
+        self.next += count
+        return ids
+
+    def __repr__(self):
+        return f"IdRange({self.prefix!r}, {self.start}, {self.stop})"
+
+
+class IdAllocator:
+    """
+    ID唯一性索引和分配器
+
+    索引以str(id)为键，整数5与字符串'5'视为同一个ID。
+    """
+
+    def __init__(self, records=(), high_water=None):
+        self.used = set()
+        self.high_water = dict(high_water or {})
+        for record in records:
+            self.add(record.get('id'))
+
+    def _mark(self, prefix, number):
+        if number is not None and number > self.high_water.get(prefix, 0):
+            self.high_water[prefix] = number
+
+    def add(self, record_id):
+        """登记一个已有ID；已存在时返回False"""
+        key = str(record_id)
+        if key in self.used:
+            return False
+        self.used.add(key)
+        self._mark(*split_id(record_id))
+        return True
+
+    def __contains__(self, record_id):
+        return str(record_id) in self.used
+
+    def __len__(self):
+        return len(self.used)
+
+    def allocate(self, prefix, count=1):
+        """分配count个新ID，编号接着该前缀已用的最大编号"""
+        ids = []
+        number = self.high_water.get(prefix, 0)
+        while len(ids) < count:
+            number += 1
+            record_id = format_id(prefix, number)
+            if str(record_id) not in self.used:
+                self.used.add(str(record_id))
+                ids.append(record_id)
+        self.high_water[prefix] = number
+        return ids
+
+    def next_id(self, prefix):
+        """分配一个新ID"""
+        return self.allocate(prefix)[0]
+
+    def reserve(self, prefix, count):
+        """预留一段连续编号，返回IdRange；这段编号不会再由本分配器分配"""
+        start = self.high_water.get(prefix, 0) + 1
+        self.high_water[prefix] = start + count - 1
+        return IdRange(prefix, start, start + count)
+
+
+def reserved_high_water(catalog_file=CATALOG_FILE):
+    """其它进程已在目录数据库中预留到的编号 {前缀: 最大编号}"""
+    from catalog_journal import open_catalog_store
+
+    conn = open_catalog_store(catalog_file)
+    high_water = {}
+    for key, value in conn.execute("SELECT key, value FROM meta WHERE key LIKE ?", (_HIGH_WATER_KEY + '%',)):
+        high_water[key[len(_HIGH_WATER_KEY):]] = int(value)
+    return high_water
+
+
+def open_allocator(records, catalog_file=CATALOG_FILE):
+    """由目录记录建立分配器，并避开其它进程已在目录数据库中预留的编号"""
+    return IdAllocator(records, reserved_high_water(catalog_file))
+
+
+def reserve_range(prefix, count, catalog_file=CATALOG_FILE):
+    """
+    为一个独立的导入进程预留count个编号，返回IdRange
+
+    预留的最大编号原子地记录在目录数据库的meta表中，多个进程同时预留也不会重叠。
+    """
+    from catalog_journal import open_catalog_store
+    from catalog_store import get_meta, set_meta
+
+    conn = open_catalog_store(catalog_file)
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        high_water = int(get_meta(conn, _HIGH_WATER_KEY + prefix, 0))
+        for (record_id,) in conn.execute('SELECT id FROM resources'):
+            record_prefix, number = split_id(record_id)
+            if record_prefix == prefix and number is not None and number > high_water:
+                high_water = number
+        set_meta(conn, _HIGH_WATER_KEY + prefix, str(high_water + count))
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return IdRange(prefix, high_water + 1, high_water + count + 1)
+
+
+def find_duplicates(records):
+    """返回 {ID: 出现次数}（只含重复的ID）"""
+    counts = {}
+    for record in records:
+        key = str(record.get('id'))
+        counts[key] = counts.get(key, 0) + 1
+    return {record_id: count for record_id, count in counts.items() if count > 1}
+
+
+def rekey_duplicates(records, high_water=None):
+    """
+    为重复ID的记录重新编号（原地修改）
+
+    每个ID第一次出现的记录保留原ID，之后出现的记录换成同前缀、编号大于
+    所有已有ID（以及high_water中预留的编号）的新ID。
+    返回 [(记录下标, 旧ID, 新ID), ...]。同样顺序的快照得到同样的新ID。
+    """
+    allocator = IdAllocator(high_water=high_water)
+    for record in records:
+        allocator._mark(*split_id(record.get('id')))
+    changes = []
+    duplicates = []
+    for index, record in enumerate(records):
+        if not allocator.add(record.get('id')):
+            duplicates.append(index)
+    for index in duplicates:
+        old_id = records[index].get('id')
+        prefix, _ = split_id(old_id)
+        new_id = allocator.next_id(prefix)
+        records[index]['id'] = new_id
+        changes.append((index, old_id, new_id))
+    return changes
+
+
+def _is_catalog(path):
+    """path是否指向目录文件（按真实路径比较，./databases_processed.json、绝对路径都算）"""
+    return os.path.realpath(path) == os.path.realpath(CATALOG_FILE)
+
+
+def _load_snapshot(path):
+    """返回 (原始数据, 资源列表)：快照是资源列表或{'resources': [...]}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data, (data['resources'] if isinstance(data, dict) else data)
+
+
+def rekey_category_index(records, changes, index_file=CATEGORY_INDEX_FILE):
+    """在category_index.json中把重新编号的记录换成新ID"""
+    with open(index_file, 'r', encoding='utf-8') as f:
+        category_index = json.load(f)
+    # 重新编号后，旧ID只属于保留它的那条记录
+    keeper_category = {str(record.get('id')): record.get('category') for record in records}
+    for index, old_id, new_id in changes:
+        category = records[index].get('category')
+        entry = category_index.get(category)
+        if entry is None:
+            continue
+        occurrences = [position for position, record_id in enumerate(entry['resources']) if record_id == old_id]
+        # 保留旧ID的记录在同一分类时，列表中的最后一个旧ID属于本记录
+        if keeper_category.get(str(old_id)) == category:
+            occurrences = occurrences[1:]
+        if occurrences:
+            entry['resources'][occurrences[-1]] = new_id
+        else:
+            entry['resources'].append(new_id)
+        entry['count'] = len(entry['resources'])
+    return category_index
+
+
+def rekey_file(path, dry_run=False):
+    """为快照文件中的重复ID重新编号，返回修改的记录数"""
+    from catalog_io import write_json_atomic
+
+    if _is_catalog(path):
+        from catalog_journal import load_catalog
+        data = records = load_catalog(path)
+        changes = rekey_duplicates(records, reserved_high_water(path))
+    else:
+        data, records = _load_snapshot(path)
+        changes = rekey_duplicates(records)
+    print(f"{path}: {len(records)} 条记录，{len(changes)} 条重复ID需要重新编号")
+    for index, old_id, new_id in changes[:10]:
+        print(f"  [{index}] {records[index].get('name')}: {old_id} -> {new_id}")
+    if dry_run or not changes:
+        return len(changes)
+
+    if _is_catalog(path):
+        # 按ID的日志操作无法区分重复ID的记录，整体重写目录；分类索引同步修改
+        from catalog_journal import write_catalog
+        write_catalog(records, path)
+        write_json_atomic(CATEGORY_INDEX_FILE, rekey_category_index(records, changes), pretty=True)
+    else:
+        write_json_atomic(path, data, pretty=True)
+    print(f"已写入 {path}")
+    return len(changes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='资源ID的分配与唯一性检查')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    check_parser = subparsers.add_parser('check', help='检查快照中的重复ID')
+    check_parser.add_argument('files', nargs='+')
+    rekey_parser = subparsers.add_parser('rekey', help='为重复ID重新编号')
+    rekey_parser.add_argument('files', nargs='+')
+    rekey_parser.add_argument('--dry-run', action='store_true', help='只显示将要修改的记录')
+    reserve_parser = subparsers.add_parser('reserve', help='为独立的导入进程预留编号')
+    reserve_parser.add_argument('prefix')
+    reserve_parser.add_argument('count', type=int)
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        found = False
+        for path in args.files:
+            _, records = _load_snapshot(path)
+            duplicates = find_duplicates(records)
+            found = found or bool(duplicates)
+            print(f"{path}: {len(records)} 条记录，{len(records) - sum(count - 1 for count in duplicates.values())} 个不同ID，"
+                  f"{len(duplicates)} 个ID重复")
+        sys.exit(1 if found else 0)
+    elif args.command == 'rekey':
+        for path in args.files:
+            rekey_file(path, args.dry_run)
+    else:
+        id_range = reserve_range(args.prefix, args.count)
+        print(f"已预留 {format_id(args.prefix, id_range.start)} ~ {format_id(args.prefix, id_range.stop - 1)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并行读取多个NAR工作簿并合并到databases_processed.json
+
+用法:
+    python ingest_workbooks.py                      # 默认读取 nar20*.xlsx
+    python ingest_workbooks.py nar2024*.xlsx nar2025web.xlsx
+    python ingest_workbooks.py --workers 8 "nar20*.xlsx"
+    python ingest_workbooks.py --scored-categories  # 分类取加权评分的主标签（见category_scoring）
+
+每个工作簿在独立进程中解析、分类和翻译；结果按文件名排序、
+按Excel行号顺序合并，ID分配与进程调度无关，重复运行结果一致。
+本工具上次写入的记录（见ingest_manifest.json）会被替换，而不是重复追加；
+其它脚本写入的记录按规范化名称/URL去重，不会被删除。
+内容未变化的工作簿不会被重新解析。
+"""
+import argparse
+import glob
+import importlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from catalog_io import PRETTY_FILE
+from catalog_journal import load_catalog, write_catalog
+from dedup_index import POLICIES, DedupIndex, dedupe, name_key, report_dedupe
+from id_allocator import id_prefix, open_allocator
+from translation_memory import memory_counts, print_report
+from workbook_manifest import (
+    MANIFEST_FILE, file_sha256, is_unchanged, load_manifest, manifest_entry,
+    save_manifest, update_entry
+)
+
+CATALOG_FILE = 'databases_processed.json'
+DEFAULT_PATTERN = 'nar20*.xlsx'
+
+# 已知工作簿的处理方式，与原来读取该工作簿的脚本一致：
+# (data_type, resource_type, 是否拆分{A}:{B}名称, 分类表和translate_description所在模块, 分类表名称, 翻译词典)
+WORKBOOK_PROFILES = {
+    'nar2024databases.xlsx': ('database', 'database', False, 'read_2024_databases', 'UPDATED_CATEGORIES', 'extended'),
+    'nar2024databases_sup.xlsx': ('database', 'database', False, 'read_2024_sup_databases', 'UPDATED_CATEGORIES', 'extended'),
+    'nar2024web.xlsx': ('web', 'web', True, 'read_2024_web_sites', 'UPDATED_CATEGORIES', 'extended_web_2024'),
+    'nar2025databases.xlsx': ('database', 'database', False, 'categorize_databases', 'CATEGORIES', 'basic'),
+    'nar2025databases_sup.xlsx': ('database', 'database', False, 'read_supplementary', 'CATEGORIES', 'additional'),
+    'nar2025web.xlsx': ('website', 'web', False, 'read_web_sites', 'WEB_CATEGORIES', 'web'),
+}
+DEFAULT_WEB_PROFILE = ('web', 'web', False, 'read_web_sites', 'WEB_CATEGORIES', 'web')
+DEFAULT_DATABASE_PROFILE = ('database', 'database', False, 'read_2024_databases', 'UPDATED_CATEGORIES', 'extended')
+
+
+def workbook_profile(path):
+    """返回工作簿的处理方式，未登记的文件按文件名推断"""
+    file_name = os.path.basename(path)
+    if file_name in WORKBOOK_PROFILES:
+        return WORKBOOK_PROFILES[file_name]
+    if 'web' in file_name.lower():
+        return DEFAULT_WEB_PROFILE
+    return DEFAULT_DATABASE_PROFILE
+
+
+def ingest_profile(path, scored=False):
+    """清单中记录的处理方式：工作簿的处理方式加上分类方法，任一变化都会重新解析"""
+    return workbook_profile(path) + ('scored' if scored else 'first_match',)
+
+
+def expand_workbooks(patterns):
+    """展开文件列表和通配符，去重后按文件名排序"""
+    paths = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern)
+        if not matches and os.path.exists(pattern):
+            matches = [pattern]
+        paths.update(os.path.normpath(match) for match in matches)
+    return sorted(paths)
+
+
+def parse_workbook(path, scored=False):
+    """
+    在子进程中解析单个工作簿（scored见nar_batch.records_from_frame）
+
+    返回 (不带ID的记录列表, 本次翻译记忆的 (命中数, 未命中数))；子进程中的命中统计
+    由主进程汇总后输出一次。
+    """
+    # 解析相关的模块较重，只在真正需要解析时导入，清单命中时不付出导入开销
+    from nar_batch import read_nar_frame, records_from_frame
+
+    hits, misses = memory_counts()
+
+    data_type, resource_type, split_name, module_name, categories_name, dictionary = workbook_profile(path)
+    module = importlib.import_module(module_name)
+    frame = read_nar_frame(path)
+    records = records_from_frame(
+        frame, 0,
+        getattr(module, categories_name), module.translate_description,
+        data_type=data_type, resource_type=resource_type, split_name=split_name,
+        dictionary=dictionary, scored=scored
+    )
+
+    source_file = os.path.basename(path)
+    excel_rows = frame['excel_row'].tolist() if not frame.empty else []
+    for record, excel_row in zip(records, excel_rows):
+        # ID在合并时分配（保持字段顺序，先占位）；没有ID的记录表示被去重跳过
+        record['id'] = None
+        record['source_file'] = source_file
+        record['excel_row'] = excel_row
+    after_hits, after_misses = memory_counts()
+    return records, (after_hits - hits, after_misses - misses)
+
+
+def parse_workbooks(paths, workers=None, scored=False):
+    """
+    用进程池并行解析多个工作簿
+
+    返回 (按paths顺序的记录列表, 全部工作簿合计的翻译记忆 (命中数, 未命中数))。
+    """
+    if len(paths) <= 1 or workers == 1:
+        results = [parse_workbook(path, scored) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(partial(parse_workbook, scored=scored), paths))
+    counts = [counts for _, counts in results]
+    return [records for records, _ in results], (sum(hits for hits, _ in counts), sum(misses for _, misses in counts))
+
+
+def owner_key(record):
+    """识别本工具写入的记录：(来源文件, ID, 规范化名称)（ID在目录中不唯一）"""
+    return (record.get('source_file'), record.get('id'), name_key(record))
+
+
+def owned_keys(entry):
+    """清单条目中本工具上次写入目录的记录（跳过的记录没有ID）"""
+    if entry is None:
+        return set()
+    return {owner_key(record) for record in entry['records'] if record.get('id') is not None}
+
+
+def merge_records(existing_data, parsed, owned, policy='skip', catalog_file=CATALOG_FILE):
+    """
+    把新解析的记录合并进现有目录
+
+    owned 为本工具上次写入的记录（见owned_keys），只有这些记录会被替换，
+    新记录放回该来源原来所在的位置，没有旧记录的来源追加到末尾；
+    其它脚本写入的记录全部保留。与保留的记录（或先合并的新记录）规范化名称或URL相同的记录
+    按policy跳过或更新已有记录（见dedup_index）；与被替换记录名称或URL相同的记录沿用原来的ID，
+    其余记录由ID索引按资源类型分配新ID（见id_allocator），不与任何已有ID冲突，
+    也不占用其它导入进程在catalog_file的数据库中预留的编号。
+    """
+    kept = [item for item in existing_data if owner_key(item) not in owned]
+    replaced = DedupIndex(item for item in existing_data if owner_key(item) in owned)
+
+    index = DedupIndex(kept)
+    allocator = open_allocator(kept, catalog_file)
+    new_records = []
+    records_by_source = {}
+    for records in parsed:
+        added, updates, skipped = dedupe(records, index, policy)
+        if updates or skipped:
+            report_dedupe(len(added), updates, skipped, policy)
+        for record in added:
+            previous = replaced.find(record)
+            record_id = previous['id'] if previous is not None else None
+            if record_id is None or not allocator.add(record_id):
+                record_id = allocator.next_id(id_prefix(record.get('resource_type')))
+            record['id'] = record_id
+            new_records.append(record)
+            records_by_source.setdefault(record['source_file'], []).append(record)
+
+    all_resources = []
+    for item in existing_data:
+        if owner_key(item) not in owned:
+            all_resources.append(item)
+        elif item.get('source_file') in records_by_source:
+            all_resources.extend(records_by_source.pop(item['source_file']))
+    for records in records_by_source.values():
+        all_resources.extend(records)
+
+    return all_resources, new_records
+
+
+def ingest_workbooks(patterns, catalog_file=CATALOG_FILE, workers=None,
+                     manifest_file=MANIFEST_FILE, force=False, pretty_file=None, policy='skip',
+                     scored=False):
+    """
+    并行读取工作簿并合并写入目录文件
+
+    内容哈希与清单一致的工作簿直接跳过；只有变化的工作簿会被重新解析，
+    也只有它们的记录会被重新写入目录。
+    """
+    paths = expand_workbooks(patterns)
+    if not paths:
+        print(f"没有找到匹配的工作簿: {patterns}")
+        return []
+
+    existing_data = load_catalog(catalog_file)
+    catalog_keys = {owner_key(item) for item in existing_data}
+
+    manifest = load_manifest(manifest_file)
+    digests = {path: file_sha256(path) for path in paths}
+
+    changed = []
+    restored = []
+    for path in paths:
+        if force or not is_unchanged(manifest, path, digests[path], ingest_profile(path, scored)):
+            changed.append(path)
+        elif not owned_keys(manifest_entry(manifest, path)) <= catalog_keys:
+            # 工作簿没变，但目录里缺少本工具写入的记录：直接用清单里的记录恢复
+            restored.append(path)
+
+    print(f"工作簿 {len(paths)}个，需要重新解析 {len(changed)}个，从清单恢复 {len(restored)}个")
+    for path in changed:
+        print(f"  - {path}")
+
+    if not changed and not restored:
+        print("所有工作簿均未变化，无需更新")
+        return existing_data
+
+    parsed, translation_counts = parse_workbooks(changed, workers, scored)
+    for path, records in zip(changed, parsed):
+        print(f"  {os.path.basename(path)}: {len(records)}条记录")
+    print_report(translation_counts)
+    for path in restored:
+        parsed.append(manifest_entry(manifest, path)['records'])
+
+    emitted = changed + restored
+    owned = set()
+    for path in emitted:
+        owned |= owned_keys(manifest_entry(manifest, path))
+    all_resources, new_records = merge_records(existing_data, parsed, owned, policy, catalog_file)
+
+    write_catalog(all_resources, catalog_file, pretty_file)
+
+    for path, records in zip(emitted, parsed):
+        update_entry(manifest, path, digests[path], records, ingest_profile(path, scored))
+    save_manifest(manifest, manifest_file)
+
+    print(f"\n成功写入 {len(new_records)} 条记录")
+    print(f"总资源数量: {len(all_resources)}")
+    return all_resources
+
+
+def main():
+    parser = argparse.ArgumentParser(description='并行读取NAR工作簿并合并到目录')
+    parser.add_argument('workbooks', nargs='*', default=[DEFAULT_PATTERN],
+                        help='工作簿路径或通配符（默认: nar20*.xlsx）')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='进程数（默认: CPU核数）')
+    parser.add_argument('--output', default=CATALOG_FILE,
+                        help='目录文件（默认: databases_processed.json）')
+    parser.add_argument('--manifest', default=MANIFEST_FILE,
+                        help='内容哈希清单（默认: ingest_manifest.json）')
+    parser.add_argument('--force', action='store_true',
+                        help='忽略清单，重新解析所有工作簿')
+    parser.add_argument('--pretty', action='store_true',
+                        help=f'同时输出格式化副本 {PRETTY_FILE}')
+    parser.add_argument('--on-duplicate', choices=POLICIES, default='skip',
+                        help='名称或URL已存在时跳过新记录或更新已有记录（默认: skip）')
+    parser.add_argument('--scored-categories', action='store_true',
+                        help='分类取加权评分的主标签，而不是第一命中的分类（见category_scoring.py）')
+    args = parser.parse_args()
+
+    ingest_workbooks(args.workbooks, args.output, args.workers, args.manifest, args.force,
+                     PRETTY_FILE if args.pretty else None, args.on_duplicate, args.scored_categories)
+
+
+if __name__ == "__main__":
+    main()
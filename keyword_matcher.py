@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分类关键词的Aho-Corasick多模式匹配
+
+原来的categorize_database()对每个分类的每个关键词做一次 `keyword in text`，
+代价是 分类数 × 关键词数 × 文本长度。这里把一张分类表的全部关键词编译成一个
+自动机（每张表只编译一次），一次扫描文本即可得到结果。
+
+结果与原来的逐个扫描完全相同：命中关键词的分类中，取在分类表里排在最前面的一个；
+都没有命中时返回默认分类。categorize_batch()一次对整列分类。
+
+用法（基准测试）:
+    python keyword_matcher.py                 # 目录全部记录 + 100万条合成记录
+    python keyword_matcher.py --records 200000
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+import numpy as np
+
+from text_tokens import normalize
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # 没有pyarrow时批量分类逐条走自动机
+    pa = None
+
+# 行数少于这个值时，编译正则的开销大于向量化带来的收益，直接走自动机
+ARROW_MIN_ROWS = 5000
+
+
+def build_automaton(keywords):
+    """
+    把关键词列表编译成Aho-Corasick自动机
+
+    返回 (delta, outputs)：delta[state] 是展开了失败转移的完整转移表（扫描时每个
+    字符只需一次字典查找，不在表中的字符回到根状态0）；outputs[state] 是到达该状态时
+    结束的全部关键词序号（包括沿失败链接得到的后缀关键词）。
+    """
+    # 状态0为根；goto[state]: 字符 -> 下一状态
+    goto = [{}]
+    outputs = [[]]
+    for index, keyword in enumerate(keywords):
+        state = 0
+        for char in keyword:
+            next_state = goto[state].get(char)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][char] = next_state
+                goto.append({})
+                outputs.append([])
+            state = next_state
+        outputs[state].append(index)
+
+    # 按广度优先计算失败链接
+    fail = [0] * len(goto)
+    delta = [dict(goto[0])]
+    delta.extend({} for _ in range(len(goto) - 1))
+    queue = list(goto[0].values())
+    for state in queue:
+        if fail[state]:
+            outputs[state].extend(outputs[fail[state]])
+        transitions = dict(delta[fail[state]])
+        for char, next_state in goto[state].items():
+            fail[next_state] = delta[fail[state]].get(char, 0)
+            transitions[char] = next_state
+            queue.append(next_state)
+        delta[state] = transitions
+    return delta, [tuple(output) for output in outputs]
+
+
+class KeywordCounter:
+    """统计文本中每个关键词出现的次数（重叠的出现都计入）"""
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self.delta, self.outputs = build_automaton(self.keywords)
+
+    def find(self, text):
+        """按出现位置依次返回命中的关键词序号"""
+        delta, outputs = self.delta, self.outputs
+        found = list(outputs[0]) * (len(text) + 1)
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                found.extend(outputs[state])
+        return found
+
+
+class KeywordMatcher:
+    """由分类表 {category_id: {'keywords': [...]}} 编译成的确定性自动机"""
+
+    def __init__(self, categories):
+        self.category_ids = list(categories)
+        keyword_categories = []
+        keywords = []
+        for index, category_id in enumerate(self.category_ids):
+            for keyword in categories[category_id]['keywords']:
+                keywords.append(normalize(keyword))
+                keyword_categories.append(index)
+        self.delta, outputs = build_automaton(keywords)
+        # 每个状态只需记住能命中的最小分类序号
+        self.best = [min((keyword_categories[index] for index in output), default=len(self.category_ids))
+                     for output in outputs]
+        # 空关键词在任何文本中都命中
+        self.always = self.best[0]
+
+    def match_index(self, text):
+        """返回text命中的分类在分类表中的最小序号，未命中时返回分类数"""
+        found = self.always
+        if found == 0:
+            return 0
+        delta, best = self.delta, self.best
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if best[state] < found:
+                found = best[state]
+                if found == 0:
+                    break
+        return found
+
+    def match(self, text, default='tools'):
+        """对已转为小写的文本分类"""
+        index = self.match_index(text)
+        return self.category_ids[index] if index < len(self.category_ids) else default
+
+
+_matchers = {}
+
+
+def compile_categories(categories):
+    """返回分类表对应的自动机；同一张表只编译一次"""
+    cached = _matchers.get(id(categories))
+    if cached is None or cached[0] is not categories:
+        cached = _matchers[id(categories)] = (categories, KeywordMatcher(categories))
+    return cached[1]
+
+
+def categorize(categories, name, description, default='tools', tokens=None):
+    """
+    根据名称和描述分类，与逐个关键词 `in` 扫描的结果相同
+
+    文本先经 text_tokens.normalize()（NFKC + 小写）规范化，全角字符等与半角关键词
+    一样能命中。tokens 为 text_tokens.tokenize_record() 给出的记录分词结果时，
+    直接使用其中规范化后的文本，结果相同。
+    """
+    text = tokens.text if tokens is not None else normalize(name) + ' ' + normalize(description)
+    return compile_categories(categories).match(text, default)
+
+
+def categorize_batch(names, descriptions, categories, default='tools'):
+    """
+    对整列名称和描述分类
+
+    返回 (分类id数组, 分类名称数组)，与逐行调用categorize()的结果相同。
+    有pyarrow时按分类顺序对整列做向量化的正则匹配（每个分类的关键词合成一个
+    RE2交替式，线性时间），已分到类的行不再参与后面的匹配；否则逐条走自动机，
+    相同的文本只匹配一次。
+    """
+    matcher = compile_categories(categories)
+    texts = [normalize(name) + ' ' + normalize(description) for name, description in zip(names, descriptions)]
+    if pa is not None and len(texts) >= ARROW_MIN_ROWS:
+        indices = _arrow_indices(texts, matcher.category_ids, categories)
+    else:
+        memo = {}
+        indices = np.fromiter(
+            (memo[text] if text in memo else memo.setdefault(text, matcher.match_index(text)) for text in texts),
+            dtype=np.intp, count=len(texts)
+        )
+    default_name = categories[default]['name'] if default in categories else default
+    category_ids = np.array(matcher.category_ids + [default], dtype=object)
+    category_names = np.array([categories[category_id]['name'] for category_id in matcher.category_ids] + [default_name],
+                              dtype=object)
+    return category_ids[indices], category_names[indices]
+
+
+def _arrow_indices(texts, category_ids, categories):
+    """用pyarrow按分类顺序逐个匹配，返回每行命中的最小分类序号"""
+    indices = np.full(len(texts), len(category_ids), dtype=np.intp)
+    remaining = np.arange(len(texts))
+    column = pa.array(texts, type=pa.string())
+    for index, category_id in enumerate(category_ids):
+        if not len(remaining):
+            break
+        keywords = [normalize(keyword) for keyword in categories[category_id]['keywords']]
+        if not keywords:
+            continue
+        if '' in keywords:
+            hit = np.ones(len(remaining), dtype=bool)
+        else:
+            pattern = '|'.join(re.escape(keyword) for keyword in keywords)
+            hit = pc.match_substring_regex(column, pattern).to_numpy(zero_copy_only=False)
+        indices[remaining[hit]] = index
+        remaining = remaining[~hit]
+        column = column.filter(pa.array(~hit))
+    return indices
+
+
+def synthetic_records(records, count, seed=0):
+    """从真实记录中随机组合名称和描述，生成count条互不相同的合成记录"""
+    rng = random.Random(seed)
+    names = [str(record.get('name', '')) for record in records]
+    descriptions = [str(record.get('short_description', '')) for record in records]
+    return ([f"{rng.choice(names)} {number}" for number in range(count)],
+            [rng.choice(descriptions) for _ in range(count)])
+
+
+def benchmark(names, descriptions, categories, label):
+    """对比逐行分类和categorize_batch()的耗时"""
+    compile_categories(categories)
+    sample = min(len(names), 100000)
+    start = time.perf_counter()
+    row_by_row = [categorize(categories, name, description)
+                  for name, description in zip(names[:sample], descriptions[:sample])]
+    row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    category_ids, _ = categorize_batch(names, descriptions, categories)
+    batch_seconds = time.perf_counter() - start
+
+    assert list(category_ids[:sample]) == row_by_row
+    print(f"{label}: {len(names):,} 条")
+    print(f"  逐行分类: {row_seconds / sample * 1e6:.2f} 微秒/条（抽样 {sample:,} 条）")
+    print(f"  批量分类: {batch_seconds:.3f} 秒，{batch_seconds / len(names) * 1e6:.2f} 微秒/条")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分类匹配基准测试')
+    parser.add_argument('--catalog', default='databases_processed.json', help='目录文件')
+    parser.add_argument('--records', type=int, default=1000000, help='合成记录数（默认: 1000000）')
+    args = parser.parse_args()
+
+    from read_2024_databases import UPDATED_CATEGORIES
+
+    with open(args.catalog, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    names = [str(record.get('name', '')) for record in records]
+    descriptions = [str(record.get('short_description', '')) for record in records]
+    benchmark(names, descriptions, UPDATED_CATEGORIES, '目录全部记录')
+
+    names, descriptions = synthetic_records(records, args.records)
+    benchmark(names, descriptions, UPDATED_CATEGORIES, '合成记录')
+
+
+if __name__ == "__main__":
+    main()
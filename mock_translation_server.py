@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地模拟翻译服务（标准库http.server）
+
+用于离线测试translation_backend的吞吐量和背压处理：
+
+  POST /translate   {"texts": [...], "target": "zh"} -> {"translations": [...]}
+  GET  /stats       已处理的请求数、拒绝数等
+
+译文由translations.json中的'extended'词典生成（与read_2024_databases.py相同）。
+每个请求等待latency秒模拟网络和推理耗时；同时处理的请求超过capacity个时
+返回429并带Retry-After，另按failure_rate随机返回503，用来检验客户端的重试和退避。
+
+用法:
+    python mock_translation_server.py                            # 监听 127.0.0.1:8765
+    python mock_translation_server.py --port 9000 --latency 0.1 --capacity 4
+    NAR_TRANSLATE_URL=http://127.0.0.1:8765/translate python read_excel.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from phrase_translator import translate_phrases
+
+DEFAULT_PORT = 8765
+RETRY_AFTER_SECONDS = 0.1
+
+
+class MockTranslationServer(ThreadingHTTPServer):
+    """带容量限制、延迟和随机故障的模拟翻译服务"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.05, capacity=8, failure_rate=0.0, dictionary='extended'):
+        super().__init__(address, MockTranslationHandler)
+        self.latency = latency
+        self.capacity = capacity
+        self.failure_rate = failure_rate
+        self.dictionary = dictionary
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.stats = {'requests': 0, 'texts': 0, 'rejected': 0, 'failed': 0, 'max_in_flight': 0}
+
+    def admit(self):
+        """占用一个处理名额；已满时返回False"""
+        with self.lock:
+            self.stats['requests'] += 1
+            if self.in_flight >= self.capacity:
+                self.stats['rejected'] += 1
+                return False
+            self.in_flight += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.in_flight)
+            return True
+
+    def release(self, texts=0, failed=False):
+        with self.lock:
+            self.in_flight -= 1
+            self.stats['texts'] += texts
+            self.stats['failed'] += failed
+
+    def stats_summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        return (f"请求 {stats['requests']} 个，翻译 {stats['texts']} 条，"
+                f"429拒绝 {stats['rejected']} 个，503故障 {stats['failed']} 个，"
+                f"最大并发 {stats['max_in_flight']}")
+
+
+class MockTranslationHandler(BaseHTTPRequestHandler):
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != '/stats':
+            self._send_json(404, {'error': 'not found'})
+            return
+        with self.server.lock:
+            self._send_json(200, dict(self.server.stats, in_flight=self.server.in_flight))
+
+    def do_POST(self):
+        if self.path != '/translate':
+            self._send_json(404, {'error': 'not found'})
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            texts = json.loads(self.rfile.read(length).decode('utf-8'))['texts']
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {'error': 'invalid request'})
+            return
+
+        server = self.server
+        if not server.admit():
+            self._send_json(429, {'error': 'too many requests'}, {'Retry-After': str(RETRY_AFTER_SECONDS)})
+            return
+        try:
+            time.sleep(server.latency)
+            if random.random() < server.failure_rate:
+                server.release(failed=True)
+                self._send_json(503, {'error': 'service unavailable'})
+                return
+            translations = [translate_phrases(str(text), server.dictionary) for text in texts]
+        except BaseException:
+            server.release(failed=True)
+            raise
+        server.release(texts=len(texts))
+        self._send_json(200, {'translations': translations})
+
+    def log_message(self, format, *args):
+        # 压测时每个请求一行日志太多，不输出
+        pass
+
+
+def start_server(host='127.0.0.1', port=DEFAULT_PORT, **options):
+    """在后台线程中启动模拟服务，返回服务对象（port=0时由系统分配端口）"""
+    server = MockTranslationServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地模拟翻译服务')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=0.05, help='每个请求的延迟（秒）')
+    parser.add_argument('--capacity', type=int, default=8, help='同时处理的请求数上限，超出返回429')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='随机返回503的比例')
+    args = parser.parse_args()
+
+    server = MockTranslationServer((args.host, args.port), latency=args.latency,
+                                   capacity=args.capacity, failure_rate=args.failure_rate)
+    print(f"模拟翻译服务: http://{args.host}:{server.server_port}/translate（Ctrl+C 停止）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{server.stats_summary()}")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NAR工作簿的批量（按列）记录转换
+
+把整张表作为DataFrame一次性转换为目录记录：'nan'清理、str()转换、
+{A}:{B}名称拆分、分类和ID分配都用列运算完成；翻译只对去重后的值调用一次。
+"""
+import pandas as pd
+
+from category_scoring import categorize_scored
+from keyword_matcher import categorize_batch
+from nar_ingest import MISSING_VALUE, iter_nar_rows
+from translation_memory import translate_cached
+from workbook_cache import load_cached_table
+
+
+def read_nar_frame(path, sheet=None):
+    """把NAR工作簿读入DataFrame，所有单元格都是字符串"""
+    table = load_cached_table(path, sheet)
+    if table is not None:
+        # 列式缓存可以直接整列转换，不需要逐行构造字典
+        return table.to_pandas()
+    return pd.DataFrame.from_records(iter_nar_rows(path, sheet))
+
+
+def text_column(frame, column):
+    """取出一列并转换为字符串，缺失值统一为'nan'（与str()的结果一致）"""
+    if column not in frame.columns:
+        return pd.Series([''] * len(frame), index=frame.index, dtype=object)
+    values = frame[column].astype(object)
+    return values.where(values.notna(), MISSING_VALUE).astype(str)
+
+
+def split_database_names(names):
+    """向量化的process_database_name：按第一个冒号拆分为(名称, 描述)"""
+    has_colon = names.str.contains(':', regex=False)
+    parts = names.str.split(':', n=1, expand=True)
+    if parts.shape[1] < 2:
+        return names, pd.Series([''] * len(names), index=names.index, dtype=object)
+
+    split_names = parts[0].str.strip().where(has_colon, names)
+    extracted = parts[1].str.strip().where(has_colon, '')
+    return split_names, extracted
+
+
+def _map_unique(values, function):
+    """对去重后的值调用function，再按原顺序展开"""
+    codes, uniques = pd.factorize(values)
+    results = [function(*value) if isinstance(value, tuple) else function(value) for value in uniques]
+    return pd.Series(results, dtype=object).take(codes).reset_index(drop=True)
+
+
+def records_from_frame(frame, ids, categories, translate,
+                       data_type='database', resource_type='database', split_name=False,
+                       dictionary=None, scored=False):
+    """
+    把NAR格式的DataFrame转换为目录记录列表
+
+    ids 为与frame行数相同的ID列表（见id_allocator），或连续整数ID的起始值；
+    categories 为分类表（整列一次分类，见keyword_matcher.categorize_batch），
+    translate(description) 返回中文描述；dictionary 为translate使用的
+    translations.json词典名称，给出时翻译经过持久化的翻译记忆（见translation_memory），
+    只有未命中的描述才会重新翻译；命中统计累计在本进程中，由脚本结束时调用
+    translation_memory.print_report()输出一次。scored为True时分类取加权评分的主标签
+    （见category_scoring），否则取第一命中的分类。字段顺序与read_*.py脚本逐行生成的记录一致。
+    """
+    if frame.empty:
+        return []
+
+    names = text_column(frame, 'Database name').reset_index(drop=True)
+    descriptions = text_column(frame, 'Short description').reset_index(drop=True)
+
+    if split_name:
+        names, extracted = split_database_names(names)
+        # 如果有从name中提取的描述，使用它；否则使用原有的Short description
+        descriptions = extracted.where(extracted != '', descriptions)
+
+    records = pd.DataFrame({
+        'id': range(ids, ids + len(frame)) if isinstance(ids, int) else list(ids),
+        'name': names,
+        'url': text_column(frame, 'URL').reset_index(drop=True),
+        'short_description': descriptions,
+        'description': descriptions,
+        'last_update': '',
+        'access': 'Free',
+        'data_type': data_type,
+        'resource_type': resource_type,
+    })
+
+    # 分类整列一次完成；翻译对相同的描述只计算一次
+    categorize = categorize_scored if scored else categorize_batch
+    records['category'], records['category_name'] = categorize(
+        records['name'].tolist(), records['short_description'].tolist(), categories)
+    if dictionary is None:
+        records['short_description_zh'] = _map_unique(records['short_description'], translate)
+    else:
+        codes, uniques = pd.factorize(records['short_description'])
+        translated, _ = translate_cached(list(uniques), translate, dictionary)
+        records['short_description_zh'] = pd.Series(translated, dtype=object).take(codes).reset_index(drop=True)
+
+    # 按列转成Python列表后再拼装字典，比DataFrame.to_dict快得多
+    columns = list(records.columns)
+    values = [records[column].tolist() for column in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NAR格式Excel工作簿的流式读取引擎
+
+所有nar20xx*.xlsx都使用相同的列（Database name / URL / Short description，
+web工作簿额外带category列）。这里用openpyxl的只读模式逐行读取，
+以生成器形式返回每一行，内存占用与工作簿大小无关。
+
+读取时优先使用workbook_cache中的列式缓存：同一工作簿只解析一次，
+之后的读取直接映射缓存文件。
+"""
+import sys
+
+from openpyxl import load_workbook
+
+# NAR工作簿的标准列
+NAR_COLUMNS = ['Database name', 'URL', 'Short description']
+
+# 与pandas读取后str()的结果保持一致：空单元格为'nan'
+MISSING_VALUE = 'nan'
+
+
+def cell_to_str(value):
+    """把单元格的值转换为字符串，行为与str(pandas单元格)一致"""
+    if value is None:
+        return MISSING_VALUE
+    return str(value)
+
+
+def _open_sheet(path, sheet=None):
+    """以只读模式打开工作簿，返回(workbook, worksheet)"""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+    return workbook, worksheet
+
+
+def _header_from(values):
+    """整理表头，去掉首尾空白，空列名按pandas的方式命名"""
+    header = []
+    for position, value in enumerate(values):
+        if value is None:
+            header.append(f'Unnamed: {position}')
+        else:
+            header.append(str(value).strip())
+    return header
+
+
+def _cached_table(path, sheet=None):
+    """返回工作簿的列式缓存表，缓存不可用时返回None"""
+    # workbook_cache依赖本模块的解析函数，这里延迟导入避免循环
+    from workbook_cache import load_cached_table
+    return load_cached_table(path, sheet)
+
+
+def read_workbook_header(path, sheet=None):
+    """直接从xlsx读取表头行，返回列名列表"""
+    workbook, worksheet = _open_sheet(path, sheet)
+    try:
+        for values in worksheet.iter_rows(min_row=1, max_row=1, values_only=True):
+            return _header_from(values)
+        return []
+    finally:
+        workbook.close()
+
+
+def _row_dict(header, excel_row, values):
+    """把一行单元格转换为 {列名: 字符串值} 字典，附带Excel行号"""
+    row = {'excel_row': excel_row}
+    for column, value in zip(header, values):
+        row[column] = cell_to_str(value)
+    # 缺失的标准列也补成'nan'，方便调用方直接取值
+    for column in NAR_COLUMNS:
+        row.setdefault(column, MISSING_VALUE)
+    return row
+
+
+def read_nar_header(path, sheet=None):
+    """
+    只读取表头行，返回列名列表
+
+    本进程已经打开了缓存表时从表的元数据中取；否则直接读xlsx的第一行，
+    不为一个表头生成或加载整张缓存表。
+    """
+    from workbook_cache import loaded_table, table_header
+    table = loaded_table(path, sheet)
+    if table is not None:
+        return table_header(table)
+    return read_workbook_header(path, sheet)
+
+
+def iter_nar_rows(path, sheet=None):
+    """
+    逐行读取NAR工作簿，生成 {列名: 字符串值} 字典
+
+    每行额外带有 'excel_row' 字段，即该行在Excel中的行号（表头为第1行）。
+    与pandas一致，中间的空行保留（各列为'nan'），只丢弃工作表末尾的空行。
+    """
+    table = _cached_table(path, sheet)
+    if table is not None:
+        from workbook_cache import iter_table_rows
+        return iter_table_rows(table)
+    return iter_workbook_rows(path, sheet)
+
+
+def _data_rows(header, rows, first_row, last_row=None):
+    """
+    把从first_row开始的单元格行转换为行字典，到last_row为止
+
+    空行先暂存，后面还有非空行时才输出：中间的空行保留，工作表末尾的空行丢弃
+    （pandas.read_excel的行为）。区间末尾是空行时会继续往后读，直到确定它们是否在末尾。
+    """
+    blank = []
+    for excel_row, values in enumerate(rows, start=first_row):
+        if last_row is not None and excel_row > last_row and not blank:
+            return
+        if all(value is None for value in values):
+            blank.append((excel_row, values))
+            continue
+
+        for blank_row, blank_values in blank:
+            if last_row is None or blank_row <= last_row:
+                yield _row_dict(header, blank_row, blank_values)
+        blank = []
+        if last_row is not None and excel_row > last_row:
+            return
+        yield _row_dict(header, excel_row, values)
+
+
+def iter_workbook_rows(path, sheet=None):
+    """直接用openpyxl只读模式逐行解析xlsx（不经过缓存）"""
+    workbook, worksheet = _open_sheet(path, sheet)
+    try:
+        rows = worksheet.iter_rows(values_only=True)
+        header = None
+        for values in rows:
+            header = _header_from(values)
+            break
+        if header is not None:
+            yield from _data_rows(header, rows, 2)
+    finally:
+        workbook.close()
+
+
+def excel_row_to_index(excel_row):
+    """Excel行号（1起，第1行是表头）转换为DataFrame索引"""
+    return excel_row - 2
+
+
+def index_to_excel_row(index):
+    """DataFrame索引转换为Excel行号"""
+    return index + 2
+
+
+def iter_excel_rows(path, first_row, last_row=None, sheet=None):
+    """
+    按Excel行号（从1开始，包含两端）读取一段数据行
+
+    有缓存时直接切片缓存表；否则用只读模式读到last_row就停止（其后紧跟空行时
+    读到下一个非空行为止），不会加载整张表。
+    first_row小于2时从第一条数据行开始（第1行是表头）。
+    """
+    first_row = max(first_row, 2)
+    table = _cached_table(path, sheet)
+    if table is not None:
+        from workbook_cache import iter_table_rows
+        return iter_table_rows(table, first_row, last_row)
+    return _iter_workbook_range(path, first_row, last_row, sheet)
+
+
+def _iter_workbook_range(path, first_row, last_row=None, sheet=None):
+    """直接从xlsx读取Excel第first_row-last_row行（不经过缓存）"""
+    workbook, worksheet = _open_sheet(path, sheet)
+    try:
+        header = []
+        for values in worksheet.iter_rows(min_row=1, max_row=1, values_only=True):
+            header = _header_from(values)
+
+        # 不设max_row：区间末尾的空行要看后面是否还有数据才能决定是否保留
+        rows = worksheet.iter_rows(min_row=first_row, values_only=True)
+        yield from _data_rows(header, rows, first_row, last_row)
+    finally:
+        workbook.close()
+
+
+def read_excel_row(path, excel_row, sheet=None):
+    """读取Excel中的某一行，行不存在时返回None"""
+    for row in iter_excel_rows(path, excel_row, excel_row, sheet):
+        return row
+    return None
+
+
+def select_rows(path, predicate, sheet=None):
+    """流式筛选满足predicate(row)的数据行"""
+    return (row for row in iter_nar_rows(path, sheet) if predicate(row))
+
+
+def check_row_range(path, first_row, last_row, expected_count=None, sheet=None):
+    """
+    读取Excel第first_row-last_row行，并检查行号换算中常见的差一错误
+
+    返回的报告包含读到的行、等价的DataFrame切片，以及发现的问题列表。
+    """
+    requested_count = last_row - first_row + 1
+    rows = list(iter_excel_rows(path, first_row, last_row, sheet))
+    start_index = excel_row_to_index(max(first_row, 2))
+    stop_index = excel_row_to_index(last_row) + 1
+
+    issues = []
+    if first_row < 2:
+        issues.append(f"第{first_row}行是表头，数据从Excel第2行开始")
+    if rows and len(rows) < requested_count and rows[-1]['excel_row'] < last_row:
+        issues.append(
+            f"工作表在Excel第{rows[-1]['excel_row']}行结束，"
+            f"请求的第{last_row}行不存在（缺少{last_row - rows[-1]['excel_row']}行）"
+        )
+    if not rows:
+        issues.append(f"Excel第{first_row}-{last_row}行没有数据")
+    if expected_count is not None and requested_count != expected_count:
+        difference = requested_count - expected_count
+        issues.append(
+            f"第{first_row}-{last_row}行共{requested_count}行，"
+            f"与预期的{expected_count}行相差{difference:+d}行"
+        )
+    # 常见错误：把“Excel第N行”当作“索引N-1”，实际取到的是第N+1行
+    hint = (
+        f"df.iloc[{first_row - 1}:{last_row}]对应的是Excel第{first_row + 1}-{last_row + 1}行，"
+        f"Excel第{first_row}-{last_row}行应为df.iloc[{start_index}:{stop_index}]"
+    )
+
+    return {
+        'first_row': first_row,
+        'last_row': last_row,
+        'requested_count': requested_count,
+        'actual_count': len(rows),
+        'iloc': (start_index, stop_index),
+        'rows': rows,
+        'issues': issues,
+        'hint': hint,
+    }
+
+
+def print_row_range_report(report):
+    """打印check_row_range的报告"""
+    print(f"Excel第{report['first_row']}-{report['last_row']}行: "
+          f"应有{report['requested_count']}行，实际读到{report['actual_count']}行")
+    start_index, stop_index = report['iloc']
+    print(f"等价的DataFrame切片: df.iloc[{start_index}:{stop_index}]")
+    for issue in report['issues']:
+        print(f"  ⚠️ {issue}")
+    print(f"  注意: {report['hint']}")
+
+
+def count_nar_rows(path, sheet=None):
+    """统计数据行数（不含表头），不把整张表读入内存"""
+    return sum(1 for _ in iter_nar_rows(path, sheet))
+
+
+def process_database_name(name_str):
+    """处理Database name列的{A}:{B}格式"""
+    name_str = str(name_str)
+
+    # 检查是否包含冒号
+    if ':' in name_str:
+        # 分割字符串
+        parts = name_str.split(':', 1)  # 只分割第一个冒号
+        if len(parts) == 2:
+            database_name = parts[0].strip()
+            short_description = parts[1].strip()
+            return database_name, short_description
+
+    # 如果没有冒号或格式不符合，返回原名称和空描述
+    return name_str, ''
+
+
+if __name__ == "__main__":
+    for workbook_path in sys.argv[1:]:
+        print(f"{workbook_path}: 列名 {read_nar_header(workbook_path)}")
+        print(f"  数据行数: {count_nar_rows(workbook_path)}")
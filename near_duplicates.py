@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+用MinHash + LSH查找近似重复的资源
+
+dedup_index.py只能发现名称或URL完全相同的记录，像 'Genome Context Viewer version 2'
+与 'Genome Context Viewer'、'antiSMASH 6.0' 与 'antiSMASH 7.0'，或2024年收录、
+2025年NAR又以改过的描述重新列出的资源都查不出来，而两两比较全部记录是平方复杂度。
+
+这里每条记录计算两个MinHash签名：
+  - 名称：去掉末尾版本号（' 7.0'、' v4.0'、' version 2'、' 2023'）、空白和标点后的
+    字符3-gram，'Genome FLTR' 与 'GenomeFLTR' 相同；
+  - 描述：分词后的单词（描述缺失或只是一个URL时没有描述签名）。
+名称签名按LSH分段（band）放入哈希桶，只有至少一段完全相同的记录才成为候选对，
+总代价接近线性。候选对再用精确的Jaccard相似度判定：
+
+  - duplicate：名称相同，或去掉版本号后名称相同且URL、主机或描述相近（可自动合并）；
+  - candidate：名称相似度 >= 0.8，或 >= 0.5 且URL相同/描述相近（需要人工确认）。
+
+很多不同的资源描述几乎相同（如 'Gene set enrichment analysis'），描述只作为佐证，
+不单独产生候选对。由duplicate相连的记录组成一个簇（默认 "merge": true），
+由candidate相连的记录另组成一个簇（默认 "merge": false），写入审核文件
+near_duplicates_review.json：每个簇列出记录、相似度和建议保留的记录（来源年份最新、字段最全）。修改审核文件后用 merge 命令合并：
+保留的记录用其它记录补全空字段，其它记录从目录中删除，category_index.json同步修改。
+
+用法:
+    python near_duplicates.py scan                        # 写出审核文件
+    python near_duplicates.py merge                       # 按审核文件合并 "merge": true 的簇
+    python near_duplicates.py merge --auto                # 重新扫描并直接合并全部duplicate簇
+    python near_duplicates.py merge --dry-run
+    python near_duplicates.py benchmark --records 100000  # 合成目录上的耗时和召回率
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+import zlib
+from datetime import datetime
+from itertools import combinations
+
+import numpy as np
+
+from catalog_io import write_json_atomic
+from catalog_store import normalize_name
+from dedup_index import PROTECTED_FIELDS, has_value
+from text_tokens import tokenize
+from url_index import canonical_url, record_url, url_host
+
+CATALOG_FILE = 'databases_processed.json'
+CATEGORY_INDEX_FILE = 'category_index.json'
+REVIEW_FILE = 'near_duplicates_review.json'
+
+# 签名长度 = 段数 × 每段行数；3行一段时，名称相似度0.5的记录对有99%的概率成为候选
+NUM_PERM = 120
+BANDS = 40
+SHINGLE_SIZE = 3
+# 同一个桶中的记录超过这个数时跳过该桶（常见片段，避免退化成两两比较）
+MAX_BUCKET = 200
+
+NAME_THRESHOLD = 0.8
+SUPPORTED_NAME_THRESHOLD = 0.5
+DESCRIPTION_THRESHOLD = 0.5
+
+# 大于2^32的最小素数，(a * x) 在uint64中不会溢出
+_PRIME = 4294967311
+_VERSION_SUFFIX = re.compile(r'(?:\s+(?:(?:version|release|v)\s*)?\d+(?:\.\d+)*)+$')
+_NON_WORD = re.compile(r'[\W_]+')
+_YEAR = re.compile(r'(?:19|20)\d\d')
+# 在审核文件中列出、也用来在合并时找回记录的字段
+_REVIEW_FIELDS = ['id', 'name', 'url', 'source_file', 'category', 'short_description']
+_KEY_FIELDS = ['id', 'name', 'url', 'source_file']
+
+
+def base_name(name):
+    """去掉末尾版本号、空白和标点后的规范化名称：'antiSMASH 7.0' -> 'antismash'"""
+    name = normalize_name(name)
+    stripped = _NON_WORD.sub('', _VERSION_SUFFIX.sub('', name))
+    return stripped or _NON_WORD.sub('', name)
+
+
+def name_shingles(name):
+    """名称的字符3-gram"""
+    text = base_name(name)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def description_terms(description):
+    """描述的单词集合；描述缺失或只是一个URL（2024年部分工作簿如此）时返回空集合"""
+    if not has_value(description):
+        return set()
+    text = str(description).strip()
+    if canonical_url(text) is not None and '://' in text:
+        return set()
+    return set(tokenize(text).terms)
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """num_perm个随机哈希函数 h(x) = (a·x + b) mod p 下的最小值"""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles):
+        """集合的签名（uint64数组）；空集合返回None"""
+        if not shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        values = (np.outer(self.a, hashes) % _PRIME + self.b[:, None]) % _PRIME
+        return values.min(axis=1)
+
+
+def lsh_candidates(signatures, bands=BANDS, max_bucket=MAX_BUCKET):
+    """
+    LSH分段：签名的某一段完全相同的记录成为候选对
+
+    signatures 为 {记录下标: 签名}，返回 {(i, j), ...}（i < j）
+    """
+    positions = np.array(sorted(signatures), dtype=np.intp)
+    if len(positions) < 2:
+        return set()
+    matrix = np.stack([signatures[position] for position in positions])
+    rows = matrix.shape[1] // bands
+    candidates = set()
+    for band in range(bands):
+        keys = np.ascontiguousarray(matrix[:, band * rows:(band + 1) * rows])
+        keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * rows))).ravel()
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(keys)]))
+        sizes = ends - starts
+        shared = (sizes > 1) & (sizes <= max_bucket)
+        for start, end in zip(starts[shared].tolist(), ends[shared].tolist()):
+            candidates.update(combinations(positions[order[start:end]].tolist(), 2))
+    return candidates
+
+
+class RecordFeatures:
+    """一条记录用于比较的特征"""
+
+    __slots__ = ('name', 'base', 'name_shingles', 'terms', 'url', 'host')
+
+    def __init__(self, record):
+        self.name = normalize_name(record.get('name'))
+        self.base = base_name(record.get('name'))
+        self.name_shingles = name_shingles(record.get('name'))
+        self.terms = description_terms(record.get('short_description'))
+        self.url = record_url(record)
+        self.host = url_host(self.url)
+
+
+def compare(a, b):
+    """比较两条记录的特征，返回证据字典；不是重复时返回None"""
+    name_similarity = jaccard(a.name_shingles, b.name_shingles)
+    if name_similarity < SUPPORTED_NAME_THRESHOLD:
+        return None
+    description_similarity = jaccard(a.terms, b.terms)
+    same_url = a.url is not None and a.url == b.url
+    same_host = a.host is not None and a.host == b.host
+    supported = same_url or description_similarity >= DESCRIPTION_THRESHOLD
+
+    if a.name and a.name == b.name:
+        level = 'duplicate'
+    elif a.base == b.base and (supported or same_host):
+        level = 'duplicate'
+    elif name_similarity >= NAME_THRESHOLD or supported:
+        level = 'candidate'
+    else:
+        return None
+    return {
+        'level': level,
+        'name_similarity': round(name_similarity, 3),
+        'description_similarity': round(description_similarity, 3),
+        'same_url': same_url,
+        'same_host': same_host,
+    }
+
+
+class UnionFind:
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        parent = self.parent.setdefault(item, item)
+        if parent != item:
+            parent = self.parent[item] = self.find(parent)
+        return parent
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+def _components(pairs):
+    """记录对的连通分量 -> [(下标列表, 记录对列表)]"""
+    linked = UnionFind()
+    for i, j, _ in pairs:
+        linked.union(i, j)
+    groups = {}
+    for pair in pairs:
+        groups.setdefault(linked.find(pair[0]), []).append(pair)
+    return [(sorted({position for i, j, _ in group for position in (i, j)}), group) for group in groups.values()]
+
+
+def find_clusters(records, hasher=None, bands=BANDS, stats=None):
+    """
+    查找近似重复的簇
+
+    返回 [{'positions': [记录下标...], 'pairs': [(i, j, 证据)...], 'auto': bool}, ...]。
+    由duplicate连接的记录组成可自动合并的簇（auto为True），排在前面；
+    由candidate连接的记录另组成需要人工确认的簇，同一条记录可能同时出现在两种簇中。
+    stats（字典）中记录候选对数等统计。
+    """
+    hasher = hasher or MinHasher()
+    features = [RecordFeatures(record) for record in records]
+    signatures = {}
+    for position, feature in enumerate(features):
+        signature = hasher.signature(feature.name_shingles)
+        if signature is not None:
+            signatures[position] = signature
+    candidates = lsh_candidates(signatures, bands)
+
+    pairs = {'duplicate': [], 'candidate': []}
+    for i, j in sorted(candidates):
+        evidence = compare(features[i], features[j])
+        if evidence is not None:
+            pairs[evidence['level']].append((i, j, evidence))
+
+    clusters = []
+    for level in ('duplicate', 'candidate'):
+        components = sorted(_components(pairs[level]), key=lambda component: component[0][0])
+        clusters.extend({'positions': positions, 'pairs': group, 'auto': level == 'duplicate'}
+                        for positions, group in components)
+
+    if stats is not None:
+        stats.update(records=len(records), candidates=len(candidates),
+                     pairs=len(pairs['duplicate']) + len(pairs['candidate']), clusters=len(clusters))
+    return clusters
+
+
+def source_year(record):
+    match = _YEAR.search(str(record.get('source_file', '')))
+    return int(match.group()) if match else 0
+
+
+def choose_keeper(records, positions):
+    """建议保留的记录：来源年份最新，其次字段最全，再其次在目录中靠前"""
+    return max(positions, key=lambda position: (
+        source_year(records[position]),
+        sum(has_value(value) for value in records[position].values()),
+        -position,
+    ))
+
+
+def review_entry(records, cluster):
+    """簇 -> 审核文件中的一项（记录用其在簇中的序号引用）"""
+    positions = cluster['positions']
+    number = {position: index for index, position in enumerate(positions)}
+    return {
+        'merge': cluster['auto'],
+        'keep': number[choose_keeper(records, positions)],
+        'records': [{field: records[position].get(field) for field in _REVIEW_FIELDS} for position in positions],
+        'pairs': [dict(evidence, records=[number[i], number[j]]) for i, j, evidence in cluster['pairs']],
+    }
+
+
+def _is_catalog(catalog_file):
+    return os.path.realpath(catalog_file) == os.path.realpath(CATALOG_FILE)
+
+
+def load_snapshot(catalog_file=CATALOG_FILE):
+    """
+    返回 (原始数据, 记录列表)
+
+    databases_processed.json经过操作日志读取（原始数据为None）；其它快照直接读文件，
+    可以是资源列表或 {'resources': [...]}，不会为它们建立SQLite库和日志。
+    """
+    if _is_catalog(catalog_file):
+        from catalog_journal import load_catalog
+        return None, load_catalog(catalog_file)
+    with open(catalog_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data, (data['resources'] if isinstance(data, dict) else data)
+
+
+def write_snapshot(catalog_file, data, records):
+    """写回load_snapshot读出的目录：databases_processed.json整体重写并清空日志，其它快照保持原来的结构"""
+    if data is None:
+        from catalog_journal import write_catalog
+        write_catalog(records, catalog_file)
+    elif isinstance(data, dict):
+        write_json_atomic(catalog_file, dict(data, resources=records), pretty=True)
+    else:
+        write_json_atomic(catalog_file, records, pretty=True)
+
+
+def scan(catalog_file=CATALOG_FILE, review_file=REVIEW_FILE):
+    """扫描目录并写出审核文件，返回审核数据"""
+    _, records = load_snapshot(catalog_file)
+    stats = {}
+    start = time.perf_counter()
+    clusters = find_clusters(records, stats=stats)
+    seconds = time.perf_counter() - start
+
+    review = {
+        'catalog': catalog_file,
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'clusters': [review_entry(records, cluster) for cluster in clusters],
+    }
+    auto = sum(entry['merge'] for entry in review['clusters'])
+    total_pairs = len(records) * (len(records) - 1) // 2
+    print(f"{catalog_file}: {len(records)} 条记录，用时 {seconds:.2f} 秒")
+    print(f"  LSH候选对 {stats['candidates']} 个（两两比较需 {total_pairs} 个），确认 {stats['pairs']} 对")
+    print(f"  近似重复簇 {len(clusters)} 个，其中可自动合并 {auto} 个，需要人工确认 {len(clusters) - auto} 个")
+    for entry in review['clusters'][:10]:
+        names = ' | '.join(str(record['name']) for record in entry['records'])
+        print(f"  {'[合并]' if entry['merge'] else '[确认]'} {names}")
+    write_json_atomic(review_file, review, pretty=True)
+    print(f"审核文件: {review_file}（修改 merge/keep 后运行 python near_duplicates.py merge）")
+    return review
+
+
+def _record_key(record):
+    return tuple(str(record.get(field)) for field in _KEY_FIELDS)
+
+
+def fill_missing(keeper, others):
+    """保留的记录中没有值的字段用其它记录（按顺序）补全，返回补上的字段（ID和来源字段不补）"""
+    fields = {}
+    for other in others:
+        for field, value in other.items():
+            if field in PROTECTED_FIELDS or field in fields:
+                continue
+            if not has_value(keeper.get(field)) and has_value(value):
+                fields[field] = value
+    keeper.update(fields)
+    return fields
+
+
+def plan_merges(records, review):
+    """
+    按审核文件计算合并
+
+    返回 (merged, skipped)：merged 为 [(保留的下标, [删除的下标...], 补上的字段)]，
+    skipped 为目录已经变化、找不到全部记录的簇数。
+    前面的簇已经并入其它记录的记录，在后面的簇中换成它并入的记录。
+    """
+    by_key = {}
+    for position, record in enumerate(records):
+        by_key.setdefault(_record_key(record), []).append(position)
+
+    merged_into = {}
+
+    def resolve(position):
+        while position in merged_into:
+            position = merged_into[position]
+        return position
+
+    merged, skipped = [], 0
+    for entry in review['clusters']:
+        if not entry.get('merge'):
+            continue
+        positions = []
+        for record in entry['records']:
+            # 完全相同的记录在簇中出现多次时依次对应目录中的不同记录
+            available = [position for position in by_key.get(_record_key(record), []) if position not in positions]
+            if not available:
+                break
+            positions.append(available[0])
+        if len(positions) != len(entry['records']):
+            skipped += 1
+            continue
+        keeper = resolve(positions[entry['keep']])
+        removed = []
+        for position in map(resolve, positions):
+            if position != keeper and position not in removed:
+                removed.append(position)
+        if not removed:
+            continue
+        fields = fill_missing(records[keeper], [records[position] for position in removed])
+        for position in removed:
+            merged_into[position] = keeper
+        merged.append((keeper, removed, fields))
+    return merged, skipped
+
+
+def category_index_path(catalog_file=CATALOG_FILE):
+    """
+    目录对应的分类索引：databases_processed.json旁边的category_index.json；
+    其它目录文件对应同目录下的 <文件名>.category_index.json（不存在时不修改任何索引）
+    """
+    directory, file_name = os.path.split(catalog_file)
+    if file_name == os.path.basename(CATALOG_FILE):
+        return os.path.join(directory, CATEGORY_INDEX_FILE)
+    return os.path.join(directory, os.path.splitext(file_name)[0] + '.' + CATEGORY_INDEX_FILE)
+
+
+def remove_from_category_index(removed_records, index_file=CATEGORY_INDEX_FILE):
+    """从category_index.json中去掉被合并记录的ID（重复ID只去掉一次）"""
+    if not os.path.exists(index_file):
+        return
+    with open(index_file, 'r', encoding='utf-8') as f:
+        category_index = json.load(f)
+    for record in removed_records:
+        entry = category_index.get(record.get('category'))
+        if entry and record.get('id') in entry['resources']:
+            entry['resources'].remove(record.get('id'))
+            entry['count'] = len(entry['resources'])
+    write_json_atomic(index_file, category_index, pretty=True)
+
+
+def merge(catalog_file=CATALOG_FILE, review_file=REVIEW_FILE, auto=False, dry_run=False):
+    """合并近似重复的记录，返回删除的记录数"""
+    if auto:
+        review = scan(catalog_file, review_file)
+    else:
+        if not os.path.exists(review_file):
+            print(f"没有审核文件 {review_file}，请先运行: python near_duplicates.py scan")
+            return 0
+        with open(review_file, 'r', encoding='utf-8') as f:
+            review = json.load(f)
+
+    data, records = load_snapshot(catalog_file)
+    merged, skipped = plan_merges(records, review)
+    removed = sorted(position for _, positions, _ in merged for position in positions)
+    print(f"\n合并 {len(merged)} 个簇，删除 {len(removed)} 条记录")
+    for keeper, positions, fields in merged[:10]:
+        names = ', '.join(str(records[position].get('name')) for position in positions)
+        print(f"  保留 {records[keeper].get('name')} ({records[keeper].get('id')}) <- {names}"
+              + (f"，补全 {sorted(fields)}" if fields else ''))
+    if skipped:
+        print(f"  跳过 {skipped} 个簇（目录在生成审核文件后已变化，请重新scan）")
+    if dry_run or not removed:
+        if dry_run:
+            print("（--dry-run，未写入）")
+        return len(removed)
+
+    # 按ID的日志操作无法区分重复ID的记录，整体重写目录
+    removed_set = set(removed)
+    write_snapshot(catalog_file, data, [record for position, record in enumerate(records) if position not in removed_set])
+    remove_from_category_index([records[position] for position in removed], category_index_path(catalog_file))
+    print(f"已写入 {catalog_file}，剩余 {len(records) - len(removed)} 条记录")
+    return len(removed)
+
+
+def synthetic_catalog(records, count, duplicate_rate=0.01, seed=0):
+    """
+    合成目录：名称由真实名称中的3-gram随机拼成，另有duplicate_rate比例的记录是
+    其它合成记录加上版本号的重新收录（URL相同）。返回 (记录列表, 重新收录的下标对)
+    """
+    rng = random.Random(seed)
+    grams = sorted({gram for record in records for gram in name_shingles(record.get('name')) if len(gram) == SHINGLE_SIZE})
+    descriptions = [str(record.get('short_description', '')) for record in records]
+    catalog, relisted = [], []
+    for number in range(count):
+        if catalog and rng.random() < duplicate_rate:
+            original = rng.randrange(len(catalog))
+            record = dict(catalog[original], name=f"{catalog[original]['name']} {rng.randint(2, 9)}.0")
+            relisted.append((original, number))
+        else:
+            name = ''.join(rng.choice(grams) for _ in range(rng.randint(3, 5)))
+            record = {'name': name, 'url': f"https://{name}.org/", 'short_description': rng.choice(descriptions)}
+        catalog.append(record)
+    return catalog, relisted
+
+
+def benchmark(count):
+    """合成目录上的扫描耗时和对重新收录的召回率"""
+    with open(CATALOG_FILE, 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+    records, relisted = synthetic_catalog(catalog, count)
+    stats = {}
+    start = time.perf_counter()
+    clusters = find_clusters(records, stats=stats)
+    seconds = time.perf_counter() - start
+
+    found = {(i, j) for cluster in clusters if cluster['auto'] for i, j, _ in cluster['pairs']}
+    recall = sum(pair in found for pair in relisted) / max(len(relisted), 1)
+    total_pairs = count * (count - 1) // 2
+    print(f"{count:,} 条合成记录: {seconds:.2f} 秒，LSH候选对 {stats['candidates']:,} 个"
+          f"（两两比较的 {stats['candidates'] / max(total_pairs, 1):.4%}），近似重复簇 {stats['clusters']:,} 个")
+    print(f"  注入的重新收录 {len(relisted):,} 对，找到 {recall:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MinHash + LSH近似重复检测')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    scan_parser = subparsers.add_parser('scan', help='扫描目录并写出审核文件')
+    merge_parser = subparsers.add_parser('merge', help='按审核文件合并近似重复的记录')
+    merge_parser.add_argument('--auto', action='store_true', help='重新扫描并直接合并全部可自动合并的簇')
+    merge_parser.add_argument('--dry-run', action='store_true', help='只显示将要合并的记录')
+    for subparser in (scan_parser, merge_parser):
+        subparser.add_argument('--catalog', default=CATALOG_FILE, help='目录文件')
+        subparser.add_argument('--review', default=REVIEW_FILE, help='审核文件')
+    benchmark_parser = subparsers.add_parser('benchmark', help='合成目录上的耗时和召回率')
+    benchmark_parser.add_argument('--records', type=int, default=100000)
+    args = parser.parse_args()
+
+    if args.command == 'scan':
+        scan(args.catalog, args.review)
+    elif args.command == 'merge':
+        merge(args.catalog, args.review, auto=args.auto, dry_run=args.dry_run)
+    else:
+        benchmark(args.records)
+
+
+if __name__ == "__main__":
+    main()
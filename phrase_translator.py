@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按词典翻译描述中的英文短语（单遍扫描的短语字典树）
+
+与read_2024_databases.py等脚本中原来的translate_description()结果逐字节相同。
+原来的做法：词典条目按长度从长到短依次处理，原文（小写）中包含该条目时，
+按词边界（\\b，不区分大小写）用re.sub替换为中文——每段描述要跑几百次正则。
+
+现在词典编译成一棵字典树（每个词典只编译一次），从左到右扫描一遍描述，
+在每个词边界处沿树找出所有命中的条目，再按原来的处理顺序（长度优先、
+同长度按词典顺序）选取互不重叠的命中，一次拼出结果。
+
+替换后的中文里如果还可能被后面的条目命中（连锁替换），单遍扫描无法复现，
+这类条目在编译时标记出来，命中它们的描述退回原来的逐条替换。
+"""
+import re
+
+# re.IGNORECASE 下与ASCII字母互相匹配的4个非ASCII字符
+_SPECIAL_FOLDS = {'İ': 'i', 'ı': 'i', 'ſ': 's', 'K': 'k'}
+_SPECIAL_FOLD_PATTERN = re.compile('[' + ''.join(_SPECIAL_FOLDS) + ']')
+_BOUNDARY_PATTERN = re.compile(r'\b')
+
+# 字典树中标记条目结束的键
+_END = None
+
+
+def _is_word(char):
+    """与正则\\w相同的判断"""
+    return char.isalnum() or char == '_'
+
+
+def _fold(text):
+    """逐字符按re.IGNORECASE的规则折叠大小写，长度与原文相同"""
+    lower = text.lower()
+    if len(lower) == len(text) and not _SPECIAL_FOLD_PATTERN.search(text):
+        return lower
+    folded = []
+    for char in text:
+        char_lower = char.lower()
+        folded.append(_SPECIAL_FOLDS.get(char, char_lower if len(char_lower) == 1 else char))
+    return ''.join(folded)
+
+
+class CompiledTranslations:
+    """一个词典编译后的结果"""
+
+    def __init__(self, translations):
+        # 原来的处理顺序：长度从长到短，同长度保持词典顺序（sorted是稳定的）
+        self.entries = sorted(translations.items(), key=lambda item: len(item[0]), reverse=True)
+        self.gates = [eng.lower() for eng, _ in self.entries]
+        self._patterns = None
+
+        self.trie = {}
+        for position, (eng, _) in enumerate(self.entries):
+            node = self.trie
+            for char in _fold(eng):
+                node = node.setdefault(char, {})
+            node.setdefault(_END, []).append(position)
+
+        # 只有ASCII条目的大小写折叠能与re.IGNORECASE完全对应
+        self.sequential_only = not all(eng.isascii() and eng for eng, _ in self.entries)
+        self.chained = set() if self.sequential_only else self._chained_entries()
+
+    def _chained_entries(self):
+        """
+        找出可能引起连锁替换的条目序号
+
+        条目的中文替换文本中可能被后面的条目命中，或者首尾字符的\\w属性与英文
+        条目不同（会改变相邻位置的词边界）时，单遍扫描的结果可能与逐条替换不同。
+        """
+        alphabet = set()
+        later_keys = []
+        chained = set()
+        for position in range(len(self.entries) - 1, -1, -1):
+            eng, chn = self.entries[position]
+            folded = _fold(chn)
+            if (not chn or '\\' in chn
+                    or _is_word(eng[0]) != _is_word(chn[0]) or _is_word(eng[-1]) != _is_word(chn[-1])
+                    or folded[0] in alphabet or folded[-1] in alphabet
+                    or (alphabet & set(folded) and any(key in folded for key in later_keys))):
+                chained.add(position)
+            later_keys.append(_fold(eng))
+            alphabet.update(later_keys[-1])
+        return chained
+
+    def patterns(self):
+        """逐条替换时使用的正则（只在需要时编译）"""
+        if self._patterns is None:
+            self._patterns = [re.compile(r'\b' + re.escape(eng) + r'\b', re.IGNORECASE) for eng, _ in self.entries]
+        return self._patterns
+
+
+_compiled = {}
+
+
+def compile_translations(translations):
+    """
+    返回词典编译后的结果；同一个词典只编译一次
+
+    translations 为字符串时表示translations.json中的词典名称，直接使用预编译产物。
+    """
+    if isinstance(translations, str):
+        from translation_dictionaries import compiled_dictionary
+        return compiled_dictionary(translations)
+    cached = _compiled.get(id(translations))
+    if cached is None or cached[0] is not translations:
+        cached = _compiled[id(translations)] = (translations, CompiledTranslations(translations))
+    return cached[1]
+
+
+def _translate_sequential(description, compiled, desc_lower):
+    """原来的逐条替换"""
+    patterns = compiled.patterns()
+    translated_desc = description
+    for position, (_, chn) in enumerate(compiled.entries):
+        if compiled.gates[position] in desc_lower:
+            translated_desc = patterns[position].sub(chn, translated_desc)
+    return translated_desc
+
+
+def find_matches(description, compiled, folded=None):
+    """
+    扫描一遍描述，返回所有命中 [(条目序号, 起点, 终点), ...]
+
+    命中要求起点和终点都在词边界上（与\\b相同）。
+    """
+    if folded is None:
+        folded = _fold(description)
+    boundaries = {match.start() for match in _BOUNDARY_PATTERN.finditer(description)}
+    trie = compiled.trie
+    length = len(description)
+    matches = []
+    for start in sorted(boundaries):
+        if start >= length:
+            break
+        node = trie.get(folded[start])
+        position = start + 1
+        while node is not None:
+            ends = node.get(_END)
+            if ends and position in boundaries:
+                matches.extend((entry, start, position) for entry in ends)
+            if position >= length:
+                break
+            node = node.get(folded[position])
+            position += 1
+    return matches
+
+
+def translate_phrases(description, translations, tokens=None):
+    """
+    用词典翻译一段描述
+
+    translations 为词典或translations.json中的词典名称；
+    tokens 为text_tokens.tokenize(description)的结果（可选）。
+    """
+    compiled = compile_translations(translations)
+    desc_lower = tokens.lower if tokens is not None else description.lower()
+    if compiled.sequential_only:
+        return _translate_sequential(description, compiled, desc_lower)
+
+    folded = desc_lower if len(desc_lower) == len(description) and not _SPECIAL_FOLD_PATTERN.search(description) \
+        else _fold(description)
+    matches = find_matches(description, compiled, folded)
+    if not matches:
+        return description
+
+    # 按原来的处理顺序选取：先处理的条目占用的位置，后面的条目不能再用；
+    # 同一条目从左到右取互不重叠的命中（与re.sub相同）
+    matches.sort()
+    occupied = bytearray(len(description))
+    chosen = []
+    current_entry = None
+    entry_end = 0
+    gate_passed = False
+    for entry, start, end in matches:
+        if entry != current_entry:
+            current_entry = entry
+            entry_end = 0
+            # 原来只有原文小写后包含该条目时才会替换
+            gate_passed = compiled.gates[entry] in desc_lower
+        if not gate_passed or start < entry_end or occupied.find(1, start, end) != -1:
+            continue
+        if entry in compiled.chained:
+            return _translate_sequential(description, compiled, desc_lower)
+        occupied[start:end] = b'\x01' * (end - start)
+        entry_end = end
+        chosen.append((start, end, compiled.entries[entry][1]))
+
+    pieces = []
+    position = 0
+    for start, end, chn in sorted(chosen):
+        pieces.append(description[position:start])
+        pieces.append(chn)
+        position = end
+    pieces.append(description[position:])
+    return ''.join(pieces)
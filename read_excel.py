@@ -3,37 +3,36 @@
 """
 读取nar2025databases.xlsx文件并提取数据库信息
 """
-import pandas as pd
-import json
-import requests
-import time
+import os
+
+from catalog_io import write_json_atomic
+from nar_ingest import iter_nar_rows, read_nar_header
+from translation_backend import TRANSLATE_URL_ENV, translate_texts
 
 def translate_text(text, target_lang='zh'):
     """
-    简单的翻译功能，这里使用一个基础的翻译逻辑
-    实际项目中可以使用Google Translate API或其他翻译服务
+    翻译单条文本，经translation_backend调用翻译服务
+    设置环境变量NAR_TRANSLATE_URL后使用HTTP翻译接口，否则返回原文
     """
-    # 这里先返回原文，后续可以集成真正的翻译API
-    return text
+    return translate_texts([text], target_lang=target_lang)[0]
+
+def translate_all(texts, target_lang='zh'):
+    """批量翻译：去重、分批并发请求（大量文本不要逐条调用translate_text）"""
+    return translate_texts(texts, target_lang=target_lang)
 
 def read_database_info():
     """读取Excel文件中的数据库信息"""
     try:
         # 读取Excel文件
-        df = pd.read_excel('nar2025databases.xlsx')
+        source_file = 'nar2025databases.xlsx'
         
         # 打印列名以了解数据结构
         print("Excel文件的列名:")
-        print(df.columns.tolist())
-        print("\n数据形状:", df.shape)
-        
-        # 显示前几行数据
-        print("\n前5行数据:")
-        print(df.head())
+        print(read_nar_header(source_file))
         
         # 将数据转换为字典格式
         databases = []
-        for index, row in df.iterrows():
+        for index, row in enumerate(iter_nar_rows(source_file)):
             db_info = {
                 'id': index + 1,
                 'name': str(row.get('Database name', '')),
@@ -48,9 +47,14 @@ def read_database_info():
             }
             databases.append(db_info)
         
+        # 配置了翻译服务时整批翻译描述
+        if os.environ.get(TRANSLATE_URL_ENV):
+            translations = translate_all([db['short_description'] for db in databases])
+            for db, translation in zip(databases, translations):
+                db['short_description_zh'] = translation
+        
         # 保存为JSON文件以便后续使用
-        with open('databases.json', 'w', encoding='utf-8') as f:
-            json.dump(databases, f, ensure_ascii=False, indent=2)
+        write_json_atomic('databases.json', databases, pretty=True)
         
         print(f"\n成功读取了 {len(databases)} 个数据库信息")
         return databases
@@ -3,68 +3,14 @@
 """
 读取nar2025databases_sup.xlsx补充数据库并与原数据合并
 """
-import pandas as pd
-import json
 import re
 
-# 补充翻译词典
-ADDITIONAL_TRANSLATIONS = {
-    'database': '数据库',
-    'resource': '资源',
-    'tool': '工具',
-    'platform': '平台',
-    'analysis': '分析',
-    'information': '信息',
-    'structure': '结构',
-    'protein': '蛋白质',
-    'gene': '基因',
-    'genome': '基因组',
-    'plant': '植物',
-    'human': '人类',
-    'biological': '生物学',
-    'molecular': '分子',
-    'cellular': '细胞',
-    'genetic': '遗传',
-    'genomic': '基因组',
-    'transcriptomic': '转录组',
-    'proteomic': '蛋白质组',
-    'metabolomic': '代谢组',
-    'bioinformatics': '生物信息学',
-    'computational': '计算',
-    'sequence': '序列',
-    'annotation': '注释',
-    'prediction': '预测',
-    'classification': '分类',
-    'functional': '功能',
-    'structural': '结构',
-    'evolutionary': '进化',
-    'comparative': '比较',
-    'cancer': '癌症',
-    'disease': '疾病',
-    'drug': '药物',
-    'therapeutic': '治疗',
-    'clinical': '临床',
-    'biomarker': '生物标记物',
-    'pathway': '通路',
-    'network': '网络',
-    'interaction': '相互作用',
-    'expression': '表达',
-    'regulation': '调控',
-    'epigenetic': '表观遗传',
-    'mutation': '突变',
-    'variant': '变异',
-    'polymorphism': '多态性',
-    'microarray': '芯片',
-    'sequencing': '测序',
-    'RNA-seq': 'RNA测序',
-    'ChIP-seq': 'ChIP测序',
-    'single-cell': '单细胞',
-    'multi-omics': '多组学',
-    'systems biology': '系统生物学',
-    'machine learning': '机器学习',
-    'artificial intelligence': '人工智能',
-    'deep learning': '深度学习'
-}
+from catalog_journal import load_catalog, publish_pending
+from dedup_index import insert_records
+from id_allocator import open_allocator
+from keyword_matcher import categorize
+from nar_ingest import iter_nar_rows, read_nar_header
+from translation_dictionaries import load_dictionary
 
 # 分类规则
 CATEGORIES = {
@@ -102,16 +48,10 @@ CATEGORIES = {
     }
 }
 
-def categorize_database(name, description):
+def categorize_database(name, description, tokens=None):
     """根据名称和描述给数据库分类"""
-    text = (name + ' ' + description).lower()
-    
-    for category_id, category_info in CATEGORIES.items():
-        for keyword in category_info['keywords']:
-            if keyword.lower() in text:
-                return category_id
-    
-    return 'tools'  # 默认分类
+    # 关键词表编译成Aho-Corasick自动机，一次扫描；结果与逐个关键词查找相同
+    return categorize(CATEGORIES, name, description, tokens=tokens)
 
 def translate_description(description):
     """翻译描述"""
@@ -122,11 +62,13 @@ def translate_description(description):
     words = re.findall(r'\b\w+\b', description.lower())
     translated_parts = []
     
+    # 词典见translations.json中的'additional'
+    translations = load_dictionary('additional')
     original_words = description.split()
     for word in original_words:
         word_lower = word.lower().strip('.,!?;:')
-        if word_lower in ADDITIONAL_TRANSLATIONS:
-            translated_parts.append(ADDITIONAL_TRANSLATIONS[word_lower])
+        if word_lower in translations:
+            translated_parts.append(translations[word_lower])
         else:
             # 保持原词
             translated_parts.append(word)
@@ -143,29 +85,24 @@ def read_supplementary_databases():
     """读取补充的数据库信息"""
     try:
         # 读取补充Excel文件
-        df_sup = pd.read_excel('nar2025databases_sup.xlsx')
+        source_file = 'nar2025databases_sup.xlsx'
         
         print("补充Excel文件的列名:")
-        print(df_sup.columns.tolist())
-        print(f"\n补充数据形状: {df_sup.shape}")
-        
-        # 显示前几行数据
-        print("\n前5行补充数据:")
-        print(df_sup.head())
+        print(read_nar_header(source_file))
         
         # 读取原始数据
-        with open('databases_processed.json', 'r', encoding='utf-8') as f:
-            original_databases = json.load(f)
+        original_databases = load_catalog()
         
         print(f"\n原始数据库数量: {len(original_databases)}")
         
         # 处理补充数据
         supplementary_databases = []
-        start_id = len(original_databases) + 1
+        # 新ID由ID索引分配，不与目录中任何已有ID冲突
+        allocator = open_allocator(original_databases)
         
-        for index, row in df_sup.iterrows():
+        for row in iter_nar_rows(source_file):
             db_info = {
-                'id': start_id + index,
+                'id': allocator.next_id('database'),
                 'name': str(row.get('Database name', '')),
                 'url': str(row.get('URL', '')),
                 'short_description': str(row.get('Short description', '')),
@@ -185,12 +122,13 @@ def read_supplementary_databases():
             
             supplementary_databases.append(db_info)
         
+        # 按名称和URL去重后追加到操作日志（目录中已有的资源跳过），不再重写整个目录文件
+        supplementary_databases = insert_records(supplementary_databases, original_databases)
+        
         # 合并数据
         all_databases = original_databases + supplementary_databases
         
-        # 保存合并后的数据
-        with open('databases_processed.json', 'w', encoding='utf-8') as f:
-            json.dump(all_databases, f, ensure_ascii=False, indent=2)
+        publish_pending()
         
         print(f"\n成功添加了 {len(supplementary_databases)} 个补充数据库")
         print(f"总数据库数量: {len(all_databases)}")
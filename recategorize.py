@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分类关键词规则变化后的增量重新分类
+
+category_rules.json 记录上一次应用到目录的规则（分类表快照及其版本号）。
+每个分类表（--rules 模块:变量）有自己的快照和关键词反向索引：
+默认的read_2024_databases:UPDATED_CATEGORIES使用category_rules.json，
+其它分类表使用 category_rules-<模块>-<变量>.json；快照记录了它来自哪个分类表，
+与--rules不一致时拒绝运行。
+修改 UPDATED_CATEGORIES（例如给omics加上'lipidomics'）后运行本脚本：
+与上次的规则比较得到变化的关键词，通过"关键词 -> 含有该关键词的记录"反向索引
+找出受影响的记录，只对这些记录重新分类，修改通过操作日志写入目录，
+并同步更新category_index.json中的分类成员。不需要重新运行导入脚本。
+
+只有当前分类与旧规则的分类结果一致的记录才会被改动；人工整理或由其它规则表
+得到的分类保持不变。
+
+用法:
+    python recategorize.py              # 应用规则变化
+    python recategorize.py --dry-run    # 只显示将要修改的记录
+    python recategorize.py --rules read_web_sites:WEB_CATEGORIES
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+
+from catalog_io import write_json_atomic
+from catalog_journal import load_catalog, publish_pending, update_records
+from keyword_matcher import categorize
+from text_tokens import normalize
+
+CATALOG_FILE = 'databases_processed.json'
+RULES_FILE = 'category_rules.json'
+CATEGORY_INDEX_FILE = 'category_index.json'
+KEYWORD_INDEX_FILE = os.path.join('.nar_cache', 'keyword_index.json')
+DEFAULT_RULES = 'read_2024_databases:UPDATED_CATEGORIES'
+
+
+def normalize_spec(spec=DEFAULT_RULES):
+    """补全省略的变量名：'read_2024_databases' 等同于 'read_2024_databases:UPDATED_CATEGORIES'"""
+    module_name, _, attribute = spec.partition(':')
+    return f"{module_name}:{attribute or 'UPDATED_CATEGORIES'}"
+
+
+def load_rules(spec=DEFAULT_RULES):
+    """按 "模块:变量" 加载分类表"""
+    module_name, _, attribute = normalize_spec(spec).partition(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _spec_suffix(spec):
+    return normalize_spec(spec).replace(':', '-')
+
+
+def rules_file_for(spec=DEFAULT_RULES):
+    """分类表对应的快照文件"""
+    if normalize_spec(spec) == DEFAULT_RULES:
+        return RULES_FILE
+    return f'category_rules-{_spec_suffix(spec)}.json'
+
+
+def keyword_index_file_for(spec=DEFAULT_RULES):
+    """分类表对应的关键词反向索引文件"""
+    if normalize_spec(spec) == DEFAULT_RULES:
+        return KEYWORD_INDEX_FILE
+    return os.path.join('.nar_cache', f'keyword_index-{_spec_suffix(spec)}.json')
+
+
+def rules_snapshot(categories):
+    """分类表中与分类结果有关的部分：分类顺序、名称和关键词"""
+    return {
+        category_id: {'name': info['name'], 'keywords': list(info['keywords'])}
+        for category_id, info in categories.items()
+    }
+
+
+def rules_version(snapshot):
+    """规则快照的版本号（内容哈希）"""
+    text = json.dumps(list(snapshot.items()), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+
+def load_applied_rules(rules_file=RULES_FILE):
+    if not os.path.exists(rules_file):
+        return None
+    with open(rules_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_applied_rules(snapshot, rules_file=RULES_FILE, spec=DEFAULT_RULES):
+    write_json_atomic(rules_file, {
+        'rules': normalize_spec(spec),
+        'version': rules_version(snapshot),
+        'categories': snapshot,
+    }, pretty=True)
+
+
+def rule_keywords(snapshot):
+    return {keyword.lower() for info in snapshot.values() for keyword in info['keywords']}
+
+
+def diff_rules(old, new):
+    """
+    比较两版规则
+
+    返回 (变化的关键词集合, 改名的分类集合, 分类顺序是否变化)。
+    关键词从一个分类移到另一个分类也算变化。
+    """
+    def pairs(snapshot):
+        return {(category_id, keyword.lower())
+                for category_id, info in snapshot.items() for keyword in info['keywords']}
+
+    changed_keywords = {keyword for _, keyword in pairs(old) ^ pairs(new)}
+    renamed = {category_id for category_id in new
+               if category_id in old and old[category_id]['name'] != new[category_id]['name']}
+    common = [category_id for category_id in old if category_id in new]
+    reordered = common != [category_id for category_id in new if category_id in old]
+    return changed_keywords, renamed, reordered
+
+
+def record_text(record):
+    """与categorize_database()相同的匹配文本"""
+    return normalize(record.get('name', '')) + ' ' + normalize(record.get('short_description', ''))
+
+
+def _fingerprint(texts):
+    return hashlib.sha1('\n'.join(texts).encode('utf-8')).hexdigest()[:16]
+
+
+def load_keyword_index(index_file=KEYWORD_INDEX_FILE):
+    if not os.path.exists(index_file):
+        return {'keywords': {}, 'fingerprints': {}}
+    with open(index_file, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    index['keywords'] = {keyword: set(ids) for keyword, ids in index['keywords'].items()}
+    return index
+
+
+def save_keyword_index(index, index_file=KEYWORD_INDEX_FILE):
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    write_json_atomic(index_file, {
+        'keywords': {keyword: sorted(ids) for keyword, ids in index['keywords'].items()},
+        'fingerprints': index['fingerprints'],
+    })
+
+
+def update_keyword_index(index, records, keywords, text_function=record_text):
+    """
+    让反向索引与目录和关键词集合保持一致，返回索引
+
+    text_function(record) 返回记录中用来匹配关键词的小写文本。
+    只有新增、文本变化或被删除的记录会重新建索引；新出现的关键词对全部记录扫描一次。
+    """
+    texts = {}
+    for record in records:
+        texts.setdefault(record.get('id'), []).append(text_function(record))
+    fingerprints = {record_id: _fingerprint(record_texts) for record_id, record_texts in texts.items()}
+
+    postings = index['keywords']
+    stale = {record_id for record_id in index['fingerprints'] if fingerprints.get(record_id) != index['fingerprints'][record_id]}
+    fresh = [record_id for record_id in fingerprints if index['fingerprints'].get(record_id) != fingerprints[record_id]]
+    if stale:
+        for ids in postings.values():
+            ids -= stale
+
+    for keyword in list(postings):
+        if keyword not in keywords:
+            del postings[keyword]
+    for keyword in keywords - set(postings):
+        postings[keyword] = {record_id for record_id in fingerprints
+                             if any(keyword in text for text in texts[record_id])}
+    for record_id in fresh:
+        for keyword in keywords:
+            if any(keyword in text for text in texts[record_id]):
+                postings[keyword].add(record_id)
+
+    index['fingerprints'] = fingerprints
+    return index
+
+
+def plan_changes(records, old, new, index):
+    """
+    计算规则变化引起的修改
+
+    返回 (updates, skipped)：updates 为 {record_id: {'category', 'category_name'}}，
+    skipped 为当前分类与旧规则结果不一致而未改动的记录id。
+    """
+    changed_keywords, renamed, reordered = diff_rules(old, new)
+    if reordered:
+        affected = {record.get('id') for record in records}
+    else:
+        affected = set()
+        for keyword in changed_keywords:
+            affected |= index['keywords'].get(keyword, set())
+
+    by_id = {}
+    for record in records:
+        by_id.setdefault(record.get('id'), []).append(record)
+
+    updates = {}
+    skipped = []
+    for record_id in affected:
+        results = set()
+        for record in by_id.get(record_id, []):
+            old_category = categorize(old, str(record.get('name', '')), str(record.get('short_description', '')))
+            new_category = categorize(new, str(record.get('name', '')), str(record.get('short_description', '')))
+            if record.get('category') != old_category:
+                results.add(None)
+            else:
+                results.add(new_category)
+        # 同一id对应多条记录且结果不一致时无法按id修改，跳过
+        if len(results) != 1 or None in results:
+            skipped.append(record_id)
+            continue
+        new_category = results.pop()
+        if new_category != by_id[record_id][0].get('category'):
+            updates[record_id] = {'category': new_category,
+                                  'category_name': new.get(new_category, {}).get('name', new_category)}
+
+    # 改名的分类只需更新category_name
+    for category_id in renamed:
+        for record_id, id_records in by_id.items():
+            if record_id not in updates and all(record.get('category') == category_id for record in id_records):
+                updates[record_id] = {'category_name': new[category_id]['name']}
+    return updates, skipped
+
+
+def update_category_index(updates, records, new, index_file=CATEGORY_INDEX_FILE):
+    """在category_index.json中移动被重新分类的记录并更新分类名称和计数"""
+    if not os.path.exists(index_file):
+        return
+    with open(index_file, 'r', encoding='utf-8') as f:
+        category_index = json.load(f)
+
+    current = {record.get('id'): record.get('category') for record in records}
+    for record_id, fields in updates.items():
+        new_category = fields.get('category')
+        if new_category is None:
+            continue
+        old_entry = category_index.get(current.get(record_id))
+        if old_entry and record_id in old_entry['resources']:
+            old_entry['resources'].remove(record_id)
+        entry = category_index.setdefault(new_category, {'name': new[new_category]['name'], 'count': 0, 'resources': []})
+        entry['resources'].append(record_id)
+
+    for category_id, entry in category_index.items():
+        if category_id in new:
+            entry['name'] = new[category_id]['name']
+        entry['count'] = len(entry['resources'])
+    write_json_atomic(index_file, category_index, pretty=True)
+
+
+def recategorize(spec=DEFAULT_RULES, catalog_file=CATALOG_FILE, rules_file=None, dry_run=False):
+    """
+    把分类表spec（"模块:变量"）的规则变化应用到目录，返回修改的记录数
+
+    rules_file 省略时使用该分类表自己的快照文件（见rules_file_for）。
+    """
+    spec = normalize_spec(spec)
+    rules_file = rules_file or rules_file_for(spec)
+    index_file = keyword_index_file_for(spec)
+    new = rules_snapshot(load_rules(spec))
+    applied = load_applied_rules(rules_file)
+    # 早期的快照没有记录分类表，它们都来自默认分类表
+    if applied is not None and applied.get('rules', DEFAULT_RULES) != spec:
+        raise ValueError(f"{rules_file} 是分类表 {applied.get('rules', DEFAULT_RULES)} 的快照，"
+                         f"不能用来比较 {spec}")
+    records = load_catalog(catalog_file)
+
+    index = update_keyword_index(load_keyword_index(index_file), records, rule_keywords(new) | rule_keywords(
+        applied['categories'] if applied else {}))
+
+    if applied is None:
+        print(f"{spec} 没有已应用的规则记录，以当前规则（版本 {rules_version(new)}）作为基线")
+        if not dry_run:
+            save_applied_rules(new, rules_file, spec)
+            save_keyword_index(index, index_file)
+        return 0
+
+    old = applied['categories']
+    if applied['version'] == rules_version(new):
+        print(f"规则未变化（版本 {applied['version']}）")
+        if not dry_run:
+            save_keyword_index(index, index_file)
+        return 0
+
+    changed_keywords, renamed, reordered = diff_rules(old, new)
+    print(f"规则版本 {applied['version']} -> {rules_version(new)}")
+    print(f"  变化的关键词: {sorted(changed_keywords)}")
+    if renamed:
+        print(f"  改名的分类: {sorted(renamed)}")
+    if reordered:
+        print("  分类顺序变化，全部记录重新分类")
+
+    updates, skipped = plan_changes(records, old, new, index)
+    current = {record.get('id'): record.get('category') for record in records}
+    for record_id, fields in updates.items():
+        if 'category' in fields:
+            print(f"  [{record_id}] {current.get(record_id)} -> {fields['category']}")
+    if skipped:
+        print(f"  跳过 {len(skipped)} 条（当前分类不是由旧规则得到，或重复ID的记录结果不一致）")
+
+    if dry_run:
+        print(f"\n将修改 {len(updates)} 条记录（--dry-run，未写入）")
+        return len(updates)
+
+    update_records(updates.items(), catalog_file)
+    update_category_index(updates, records, new)
+    publish_pending(catalog_file)
+    save_applied_rules(new, rules_file, spec)
+    save_keyword_index(index, index_file)
+    print(f"\n已重新分类 {len(updates)} 条记录")
+    return len(updates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='规则变化后的增量重新分类')
+    parser.add_argument('--rules', default=DEFAULT_RULES,
+                        help=f'分类表，格式为 模块:变量（默认: {DEFAULT_RULES}）')
+    parser.add_argument('--dry-run', action='store_true', help='只显示将要修改的记录')
+    args = parser.parse_args()
+
+    try:
+        recategorize(args.rules, dry_run=args.dry_run)
+    except ValueError as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
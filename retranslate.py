@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+翻译词典变化后的增量重新翻译
+
+translations_applied.json 记录上一次应用到目录的词典内容（按词典名称保存）。
+在translations.json中修改词典（例如给'extended'加上一个短语）后运行本脚本：
+与上次应用的词典比较得到变化的短语，通过"短语 -> 描述中含有该短语的记录"
+反向索引找出受影响的记录，只对这些记录重新翻译，修改通过操作日志写入目录。
+不需要重新运行导入脚本。
+
+只有当前short_description_zh与旧词典的翻译结果一致的记录才会被改动；
+人工修改过或由其它词典翻译的描述保持不变。
+
+用法:
+    python retranslate.py                           # 应用'extended'词典的变化
+    python retranslate.py --dictionary extended_96
+    python retranslate.py --dry-run                 # 只显示将要修改的记录
+"""
+import argparse
+import json
+import os
+
+from catalog_io import write_json_atomic
+from catalog_journal import load_catalog, publish_pending, update_records
+from phrase_translator import CompiledTranslations, translate_phrases
+from recategorize import load_keyword_index, save_keyword_index, update_keyword_index
+from translation_dictionaries import dictionary_version, load_dictionary
+
+CATALOG_FILE = 'databases_processed.json'
+APPLIED_FILE = 'translations_applied.json'
+CACHE_DIR = '.nar_cache'
+
+# 用phrase_translator按短语翻译的词典（其它词典的翻译方式不同，不在此处理）
+PHRASE_DICTIONARIES = ['extended', 'extended_web_2024', 'extended_96', 'extended_3d_gnome']
+
+
+def description_text(record):
+    """与translate_phrases()判断条目是否需要处理时相同的文本"""
+    return str(record.get('short_description', '')).lower()
+
+
+def phrase_index_file(name):
+    """每个词典一个反向索引文件"""
+    return os.path.join(CACHE_DIR, f'phrase_index-{name}.json')
+
+
+def load_applied(applied_file=APPLIED_FILE):
+    if not os.path.exists(applied_file):
+        return {}
+    with open(applied_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_applied(applied, applied_file=APPLIED_FILE):
+    write_json_atomic(applied_file, applied, pretty=True)
+
+
+def diff_dictionaries(old, new):
+    """
+    比较两版词典，返回变化的短语（小写）集合
+
+    新增、删除和译文改变的短语都算变化；同样长度的短语处理顺序改变时，
+    这些短语之间的优先级变了，也算变化。
+    """
+    changed = {eng for eng in old.keys() | new.keys() if old.get(eng) != new.get(eng)}
+
+    def order_by_length(translations):
+        groups = {}
+        for eng, _ in CompiledTranslations(translations).entries:
+            if eng in old and eng in new:
+                groups.setdefault(len(eng), []).append(eng)
+        return groups
+
+    old_groups, new_groups = order_by_length(old), order_by_length(new)
+    for length, group in new_groups.items():
+        if old_groups.get(length) != group:
+            changed.update(group)
+    return {eng.lower() for eng in changed}
+
+
+def translatable(description):
+    return bool(description) and description != 'nan'
+
+
+def affected_records(index, changed_phrases):
+    """描述中含有任一变化短语的记录id"""
+    affected = set()
+    for phrase in changed_phrases:
+        affected |= index['keywords'].get(phrase, set())
+    return affected
+
+
+def plan_changes(records, old, new, affected):
+    """
+    计算词典变化引起的修改（只检查affected中的记录）
+
+    返回 (updates, skipped)：updates 为 {record_id: {'short_description_zh': 新译文}}，
+    skipped 为当前译文与旧词典结果不一致而未改动的记录id。
+    """
+    by_id = {}
+    for record in records:
+        by_id.setdefault(record.get('id'), []).append(record)
+
+    updates = {}
+    skipped = []
+    for record_id in affected:
+        results = set()
+        for record in by_id.get(record_id, []):
+            description = str(record.get('short_description', ''))
+            if not translatable(description):
+                continue
+            if record.get('short_description_zh') != translate_phrases(description, old):
+                results.add(None)
+            else:
+                results.add(translate_phrases(description, new))
+        # 同一id对应多条记录且结果不一致时无法按id修改，跳过
+        if len(results) != 1 or None in results:
+            if results:
+                skipped.append(record_id)
+            continue
+        translation = results.pop()
+        if translation != by_id[record_id][0].get('short_description_zh'):
+            updates[record_id] = {'short_description_zh': translation}
+    return updates, skipped
+
+
+def retranslate(name, catalog_file=CATALOG_FILE, applied_file=APPLIED_FILE, dry_run=False):
+    """把词典name的变化应用到目录，返回修改的记录数"""
+    new = load_dictionary(name)
+    version = dictionary_version(name)
+    applied_all = load_applied(applied_file)
+    applied = applied_all.get(name)
+    records = load_catalog(catalog_file)
+
+    phrases = {eng.lower() for eng in new} | {eng.lower() for eng in (applied or {}).get('translations', {})}
+    index_file = phrase_index_file(name)
+    index = update_keyword_index(load_keyword_index(index_file), records, phrases, description_text)
+
+    if applied is None:
+        print(f"没有词典'{name}'已应用的记录，以当前词典（版本 {version}）作为基线")
+        if not dry_run:
+            applied_all[name] = {'version': version, 'translations': new}
+            save_applied(applied_all, applied_file)
+            save_keyword_index(index, index_file)
+        return 0
+
+    if applied['version'] == version:
+        print(f"词典'{name}'未变化（版本 {version}）")
+        if not dry_run:
+            save_keyword_index(index, index_file)
+        return 0
+
+    old = applied['translations']
+    changed_phrases = diff_dictionaries(old, new)
+    print(f"词典'{name}'版本 {applied['version']} -> {version}")
+    print(f"  变化的短语: {len(changed_phrases)} 个 {sorted(changed_phrases)[:10]}")
+
+    affected = affected_records(index, changed_phrases)
+    updates, skipped = plan_changes(records, old, new, affected)
+    print(f"  描述中含有变化短语的记录: {len(affected)} 条（全部 {len(records)} 条）")
+    current = {record.get('id'): record.get('short_description_zh') for record in records}
+    for record_id, fields in list(updates.items())[:10]:
+        print(f"  [{record_id}] {current.get(record_id)} -> {fields['short_description_zh']}")
+    if skipped:
+        print(f"  跳过 {len(skipped)} 条（当前译文不是由旧词典得到，或重复ID的记录结果不一致）")
+
+    if dry_run:
+        print(f"\n将修改 {len(updates)} 条记录（--dry-run，未写入）")
+        return len(updates)
+
+    update_records(updates.items(), catalog_file)
+    publish_pending(catalog_file)
+    applied_all[name] = {'version': version, 'translations': new}
+    save_applied(applied_all, applied_file)
+    save_keyword_index(index, index_file)
+    print(f"\n已重新翻译 {len(updates)} 条记录")
+    return len(updates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='词典变化后的增量重新翻译')
+    parser.add_argument('--dictionary', choices=PHRASE_DICTIONARIES, default='extended',
+                        help='translations.json中的词典名称（默认: extended）')
+    parser.add_argument('--dry-run', action='store_true', help='只显示将要修改的记录')
+    args = parser.parse_args()
+
+    retranslate(args.dictionary, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
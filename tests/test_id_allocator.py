@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""重复ID的重新编号与预留编号"""
+import json
+
+from id_allocator import IdAllocator, find_duplicates, open_allocator, rekey_duplicates, rekey_file, reserve_range
+from ingest_workbooks import merge_records
+
+
+def snapshot():
+    return [
+        {'id': 'database_001', 'name': 'A'},
+        {'id': 'database_002', 'name': 'B'},
+        {'id': 'database_001', 'name': 'C'},
+        {'id': 'web_004', 'name': 'D'},
+        {'id': 'web_004', 'name': 'E'},
+        {'id': 7, 'name': 'F'},
+        {'id': '7', 'name': 'G'},
+    ]
+
+
+def test_rekey_keeps_first_occurrence():
+    records = snapshot()
+    changes = rekey_duplicates(records)
+    assert changes == [(2, 'database_001', 'database_003'), (4, 'web_004', 'web_005'), (6, '7', 8)]
+    assert [record['id'] for record in records[:2]] == ['database_001', 'database_002']
+    assert find_duplicates(records) == {}
+    # 同样顺序的快照得到同样的新ID
+    assert rekey_duplicates(snapshot()) == changes
+
+
+def test_rekey_skips_reserved_numbers():
+    records = snapshot()
+    changes = rekey_duplicates(records, {'database': 50})
+    assert changes[0] == (2, 'database_001', 'database_051')
+
+
+def test_rekey_file_keeps_snapshot_structure(tmp_path):
+    path = tmp_path / 'snapshot.json'
+    path.write_text(json.dumps({'metadata': {'version': 1}, 'resources': snapshot()}), encoding='utf-8')
+    assert rekey_file(str(path)) == 3
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data['metadata'] == {'version': 1}
+    assert find_duplicates(data['resources']) == {}
+    assert rekey_file(str(path)) == 0
+
+
+def test_allocator_continues_after_reserved_range(tmp_path):
+    catalog_file = str(tmp_path / 'catalog.json')
+    records = [{'id': 'database_010', 'name': 'A'}]
+    with open(catalog_file, 'w', encoding='utf-8') as f:
+        json.dump(records, f)
+    reserved = reserve_range('database', 5, catalog_file)
+    assert (reserved.start, reserved.stop) == (11, 16)
+    assert IdAllocator(records).next_id('database') == 'database_011'
+    assert open_allocator(records, catalog_file).next_id('database') == 'database_016'
+
+
+def test_merge_records_respects_reserved_range(tmp_path):
+    catalog_file = str(tmp_path / 'catalog.json')
+    existing = [{'id': 'database_010', 'name': 'A', 'url': 'https://a.org', 'source_file': 'old.xlsx'}]
+    with open(catalog_file, 'w', encoding='utf-8') as f:
+        json.dump(existing, f)
+    reserve_range('database', 5, catalog_file)
+    parsed = [[{'id': None, 'name': 'B', 'url': 'https://b.org', 'resource_type': 'database',
+                'source_file': 'new.xlsx'}]]
+    _, new_records = merge_records(existing, parsed, set(), catalog_file=catalog_file)
+    assert [record['id'] for record in new_records] == ['database_016']
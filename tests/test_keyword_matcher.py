@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""批量分类与逐条分类在各种输入上结果一致"""
+import keyword_matcher
+from keyword_matcher import categorize, categorize_batch
+from read_2024_databases import UPDATED_CATEGORIES
+from text_tokens import tokenize_record
+
+SAMPLES = [
+    ('ＰＲＯＴＥＩＮ atlas', ''),
+    ('Atlas', 'ＧＥＮＯＭＥ browser for ｍｉｃｒｏｂｅｓ'),
+    ('ＲＮＡ', 'ｍｉｃｒｏＲＮＡ targets'),
+    ('Ｃｈｅｍ', 'drug–target ｉｎｔｅｒａｃｔｉｏｎｓ'),
+    ('ﬁnder', 'proﬁle search'),
+    ('ÄRZTE', 'Ｄｉｓｅａｓｅ variants and ＧＷＡＳ'),
+    ('３′aQTL', '3′ UTR ＴＲＡＮＳＣＲＩＰＴＳ'),
+    ('ΠΡΩΤΕΪΝΗ', 'Ελληνικά'),
+    ('蛋白质数据库', '结构 ＳＴＲＵＣＴＵＲＥ'),
+    ('plain', 'protein structure database'),
+    ('', ''),
+]
+
+
+def single(name, description):
+    return categorize(UPDATED_CATEGORIES, name, description)
+
+
+def test_single_paths_agree():
+    for name, description in SAMPLES:
+        tokens, _ = tokenize_record(name, description)
+        assert single(name, description) == categorize(UPDATED_CATEGORIES, name, description, tokens=tokens)
+
+
+def test_fullwidth_matches_halfwidth():
+    assert single('ＰＲＯＴＥＩＮ atlas', '') == single('PROTEIN atlas', '') == 'protein'
+
+
+def test_batch_agrees_with_single():
+    names = [name for name, _ in SAMPLES]
+    descriptions = [description for _, description in SAMPLES]
+    category_ids, _ = categorize_batch(names, descriptions, UPDATED_CATEGORIES)
+    assert list(category_ids) == [single(name, description) for name, description in SAMPLES]
+
+
+def test_arrow_batch_agrees_with_single():
+    if keyword_matcher.pa is None:
+        return
+    repeat = keyword_matcher.ARROW_MIN_ROWS // len(SAMPLES) + 1
+    names = [name for name, _ in SAMPLES] * repeat
+    descriptions = [description for _, description in SAMPLES] * repeat
+    category_ids, _ = categorize_batch(names, descriptions, UPDATED_CATEGORIES)
+    assert list(category_ids) == [single(name, description) for name, description in SAMPLES] * repeat
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""重新编译词典前检查脚本中的副本"""
+import json
+
+import pytest
+
+import translation_dictionaries
+from translation_dictionaries import DictionaryError, build
+
+
+def test_build_refuses_diverged_script_copy(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_dictionaries, 'CACHE_DIR', str(tmp_path / 'cache'))
+    source_file = tmp_path / 'translations.json'
+    source_file.write_text(json.dumps({'web': {'database': '数据库'}}, ensure_ascii=False), encoding='utf-8')
+    (tmp_path / 'read_web_sites.py').write_text("WEB_TRANSLATIONS = {'database': '资料库'}\n", encoding='utf-8')
+    with pytest.raises(DictionaryError):
+        build(str(source_file))
+    assert not (tmp_path / 'cache').exists()
+
+    (tmp_path / 'read_web_sites.py').write_text("WEB_TRANSLATIONS = {'database': '数据库'}\n", encoding='utf-8')
+    assert build(str(source_file)).startswith(str(tmp_path / 'cache'))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+记录文本的一次性规范化与分词
+
+分类和翻译原来各自对同一段文本做lower()和多次扫描。这里每条记录只处理一遍：
+NFKC规范化、转小写、按词边界切分，分类器和翻译器都使用这一结果。
+
+撇号/prime（如 3′aQTL、5'UTR）连接的部分视为一个术语，不拆成 '3' 和 'aqtl'；
+同时保留按\\w+切分的单词，与原来基于\\b的词边界匹配保持一致。
+"""
+import re
+import unicodedata
+
+# prime和撇号：出现在两个单词字符之间时不断开术语
+PRIMES = "′″‴'’"
+_TERM_PATTERN = re.compile(r"\w+(?:[" + PRIMES + r"]\w+)*")
+_PRIME_PATTERN = re.compile("[" + PRIMES + "]")
+
+
+class TextTokens:
+    """
+    一段文本的分词结果
+
+    lower: str(text).lower()，与原来各函数中的lower()结果相同
+    text:  NFKC规范化后的小写文本（分类匹配使用）
+    terms: text中的术语（prime连接的部分不拆开）
+    words: lower中按\\w+切分的单词（按出现顺序，词边界匹配使用）
+    """
+
+    __slots__ = ('lower', 'text', 'terms', 'words')
+
+    def __init__(self, lower, text, terms, words):
+        self.lower = lower
+        self.text = text
+        self.terms = terms
+        self.words = words
+
+
+def _split_words(terms):
+    """术语按prime拆成\\w+单词"""
+    words = []
+    for term in terms:
+        if _PRIME_PATTERN.search(term):
+            words.extend(part for part in _PRIME_PATTERN.split(term) if part)
+        else:
+            words.append(term)
+    return words
+
+
+def normalize(text, lower=None):
+    """NFKC规范化并转小写；分类匹配的文本都经过这里（lower为已算好的str(text).lower()）"""
+    text = str(text)
+    if lower is None:
+        lower = text.lower()
+    return lower if unicodedata.is_normalized('NFKC', text) else unicodedata.normalize('NFKC', text).lower()
+
+
+def tokenize(text):
+    """规范化并分词；文本本来就是NFKC形式时只扫描一遍"""
+    text = str(text)
+    lower = text.lower()
+    normalized = normalize(text, lower)
+    terms = _TERM_PATTERN.findall(normalized)
+    if normalized is lower:
+        words = _split_words(terms)
+    else:
+        # NFKC改变了文本时，词边界匹配仍以原文为准
+        words = re.findall(r'\w+', lower)
+    return TextTokens(lower, normalized, terms, words)
+
+
+def tokenize_record(name, description):
+    """
+    对一条记录的名称和描述分词
+
+    返回 (记录的分词结果, 描述的分词结果)：前者的文本为 名称 + ' ' + 描述，
+    供分类使用；后者供翻译使用。名称和描述各只扫描一遍。
+    """
+    name_tokens = tokenize(name)
+    description_tokens = tokenize(description)
+    record_tokens = TextTokens(
+        name_tokens.lower + ' ' + description_tokens.lower,
+        name_tokens.text + ' ' + description_tokens.text,
+        name_tokens.terms + description_tokens.terms,
+        name_tokens.words + description_tokens.words,
+    )
+    return record_tokens, description_tokens
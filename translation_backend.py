@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可替换的批量异步翻译后端
+
+read_excel.translate_text()以后要调用真正的翻译API，逐行串行调用在我们的数据量下
+太慢。这里把描述去重后按条数和字符数分批，每批一个请求，用asyncio并发发送：
+
+  - 限制同时在途的请求数；收到429时自动降低并发，之后逐步恢复；
+  - 令牌桶限速（每秒请求数）；
+  - 429/5xx/网络错误按指数退避重试，服务端给出Retry-After时按它等待。
+
+后端只需实现 translate_batch(texts, target_lang)（协程），返回与texts等长的译文列表。
+内置两个后端：
+  - IdentityBackend：返回原文（没有配置翻译服务时的默认行为，与原来的占位实现相同）；
+  - HttpTranslationBackend：POST JSON {"texts": [...], "target": "zh"}，
+    返回 {"translations": [...]}，协议与mock_translation_server.py相同。
+
+设置环境变量 NAR_TRANSLATE_URL 后默认使用HTTP后端。
+
+用法:
+    python translation_backend.py benchmark                  # 启动本地模拟服务并测试吞吐量
+    python translation_backend.py benchmark --records 20000 --concurrency 16 --rate 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+TRANSLATE_URL_ENV = 'NAR_TRANSLATE_URL'
+
+MAX_BATCH_TEXTS = 50
+MAX_BATCH_CHARS = 8000
+CONCURRENCY = 8
+RATE_LIMIT = 50.0  # 每秒请求数
+RETRIES = 5
+# 429（限流）的重试次数单独计算
+THROTTLE_RETRIES = 50
+BACKOFF_SECONDS = 0.2
+REQUEST_TIMEOUT = 30
+# HTTP后端执行阻塞请求的线程数，是并发数的上限（asyncio默认线程池在单核机器上只有5个线程）
+MAX_WORKERS = 64
+
+
+class TranslationError(Exception):
+    """
+    翻译请求失败
+
+    retryable 表示是否可以重试，throttled 表示被服务端限流（429），
+    retry_after 为服务端要求的等待秒数。
+    """
+
+    def __init__(self, message, retryable=False, throttled=False, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.throttled = throttled
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """
+    解析Retry-After响应头，返回等待秒数；无法解析时返回None（按计算的退避时间等待）
+
+    Retry-After可以是秒数，也可以是HTTP日期（如 'Wed, 21 Oct 2026 07:28:00 GMT'）。
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class IdentityBackend:
+    """不翻译，返回原文"""
+
+    async def translate_batch(self, texts, target_lang='zh'):
+        return list(texts)
+
+
+class HttpTranslationBackend:
+    """
+    通过HTTP JSON接口翻译（标准库urllib，在线程中执行阻塞的请求）
+
+    后端持有一个线程池，用完后调用close()，或者用 with 语句管理。
+    """
+
+    def __init__(self, url, timeout=REQUEST_TIMEOUT, max_workers=MAX_WORKERS):
+        self.url = url
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='translate')
+
+    def close(self):
+        """关闭线程池"""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _post(self, texts, target_lang):
+        body = json.dumps({'texts': texts, 'target': target_lang}, ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            raise TranslationError(
+                f"HTTP {e.code}", retryable=e.code == 429 or e.code >= 500, throttled=e.code == 429,
+                retry_after=parse_retry_after(e.headers.get('Retry-After'))
+            )
+        except (urllib.error.URLError, OSError) as e:
+            raise TranslationError(f"请求失败: {e}", retryable=True)
+
+        translations = payload.get('translations')
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            raise TranslationError(f"响应格式错误: 期望 {len(texts)} 条译文")
+        return translations
+
+    async def translate_batch(self, texts, target_lang='zh'):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._post, texts, target_lang)
+
+
+_http_backend = None
+
+
+def default_backend():
+    """
+    配置了NAR_TRANSLATE_URL时使用HTTP后端，否则返回原文
+
+    HTTP后端在进程内只创建一次（URL改变时换新的），逐条调用translate_texts()
+    不会每次都新建线程池。
+    """
+    global _http_backend
+    url = os.environ.get(TRANSLATE_URL_ENV)
+    if not url:
+        return IdentityBackend()
+    if _http_backend is None or _http_backend.url != url:
+        if _http_backend is not None:
+            _http_backend.close()
+        _http_backend = HttpTranslationBackend(url)
+    return _http_backend
+
+
+class RateLimiter:
+    """令牌桶限速：平均每秒rate个请求，允许burst个的突发"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ConcurrencyLimit:
+    """
+    可调整的并发上限（代替固定的信号量）
+
+    收到429时上限减半，之后每连续成功"上限"次加1（加性增、乘性减），
+    服务端容量不足时客户端自动降到它能承受的并发数，而不是一直重试到失败。
+    """
+
+    def __init__(self, limit):
+        self.max_limit = limit
+        self.limit = limit
+        self.in_flight = 0
+        self.successes = 0
+        self.condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def succeeded(self):
+        self.successes += 1
+        if self.successes >= self.limit and self.limit < self.max_limit:
+            self.limit += 1
+            self.successes = 0
+
+    def throttled(self):
+        self.limit = max(1, self.limit // 2)
+        self.successes = 0
+
+
+def make_batches(texts, max_texts=MAX_BATCH_TEXTS, max_chars=MAX_BATCH_CHARS):
+    """按条数和字符数上限分批，返回 [[文本, ...], ...]（单条超长的文本单独成批）"""
+    batches = []
+    batch, chars = [], 0
+    for text in texts:
+        if batch and (len(batch) >= max_texts or chars + len(text) > max_chars):
+            batches.append(batch)
+            batch, chars = [], 0
+        batch.append(text)
+        chars += len(text)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class TranslationStats:
+    """一次批量翻译的统计"""
+
+    def __init__(self):
+        self.texts = 0
+        self.requests = 0
+        self.retries = 0
+        self.seconds = 0.0
+        self.final_concurrency = None
+
+    def report(self):
+        rate = self.texts / self.seconds if self.seconds else 0.0
+        return (f"翻译 {self.texts} 条（{self.requests} 个请求，重试 {self.retries} 次，"
+                f"最终并发 {self.final_concurrency}），用时 {self.seconds:.2f} 秒（{rate:,.0f} 条/秒）")
+
+
+async def _send_batch(backend, batch, target_lang, limit, limiter, retries, stats):
+    failures = throttles = 0
+    while True:
+        if limiter is not None:
+            await limiter.acquire()
+        async with limit:
+            stats.requests += 1
+            try:
+                translations = await backend.translate_batch(batch, target_lang)
+                limit.succeeded()
+                return translations
+            except TranslationError as e:
+                # 429是服务端的背压信号：降低并发，单独计数，不算作失败
+                if e.throttled:
+                    limit.throttled()
+                    throttles += 1
+                else:
+                    failures += 1
+                if not e.retryable or failures > retries or throttles > THROTTLE_RETRIES:
+                    raise
+                delay = e.retry_after if e.retry_after is not None else BACKOFF_SECONDS * 2 ** (failures - 1)
+        # 退避等待时不占用并发名额
+        stats.retries += 1
+        await asyncio.sleep(delay * (1 + random.random() * 0.5))
+
+
+async def translate_async(texts, backend=None, target_lang='zh', concurrency=CONCURRENCY,
+                          rate=RATE_LIMIT, retries=RETRIES, max_texts=MAX_BATCH_TEXTS,
+                          max_chars=MAX_BATCH_CHARS, stats=None):
+    """
+    批量翻译，返回与texts顺序相同的译文列表
+
+    相同的文本只翻译一次；空文本和'nan'原样返回。rate为None时不限速。
+    """
+    backend = backend or default_backend()
+    stats = stats if stats is not None else TranslationStats()
+    start = time.perf_counter()
+
+    unique = list(dict.fromkeys(text for text in texts if text and text != 'nan'))
+    batches = make_batches(unique, max_texts, max_chars)
+    limit = ConcurrencyLimit(concurrency)
+    limiter = RateLimiter(rate) if rate else None
+    results = await asyncio.gather(*(
+        _send_batch(backend, batch, target_lang, limit, limiter, retries, stats) for batch in batches
+    ))
+    stats.final_concurrency = limit.limit
+
+    translated = {}
+    for batch, translations in zip(batches, results):
+        translated.update(zip(batch, translations))
+    stats.texts += len(unique)
+    stats.seconds += time.perf_counter() - start
+    return [translated.get(text, text) for text in texts]
+
+
+def translate_texts(texts, backend=None, target_lang='zh', **options):
+    """translate_async的同步入口（在没有运行事件循环的代码中使用）"""
+    return asyncio.run(translate_async(list(texts), backend, target_lang, **options))
+
+
+def benchmark(records, concurrency, rate, latency, capacity, failure_rate):
+    """启动本地模拟翻译服务，测试批量翻译的吞吐量和退避行为"""
+    from keyword_matcher import synthetic_records
+    from mock_translation_server import start_server
+
+    with open('databases_processed.json', 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+    names, descriptions = synthetic_records(catalog, records)
+    # 合成名称互不相同，拼上名称使每条文本都需要翻译（不会被去重）
+    texts = [f"{name}: {description}" for name, description in zip(names, descriptions)]
+
+    server = start_server(port=0, latency=latency, capacity=capacity, failure_rate=failure_rate)
+    try:
+        with HttpTranslationBackend(f"http://127.0.0.1:{server.server_port}/translate") as backend:
+            stats = TranslationStats()
+            translate_texts(texts, backend, concurrency=concurrency, rate=rate, stats=stats)
+        print(stats.report())
+        print(f"模拟服务: {server.stats_summary()}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量异步翻译后端')
+    parser.add_argument('command', choices=['benchmark'])
+    parser.add_argument('--records', type=int, default=10000, help='合成描述数')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help='同时在途的请求数')
+    parser.add_argument('--rate', type=float, default=RATE_LIMIT, help='每秒请求数上限（0表示不限速）')
+    parser.add_argument('--latency', type=float, default=0.05, help='模拟服务每个请求的延迟（秒）')
+    parser.add_argument('--capacity', type=int, default=8, help='模拟服务同时处理的请求数上限')
+    parser.add_argument('--failure-rate', type=float, default=0.02, help='模拟服务随机返回503的比例')
+    args = parser.parse_args()
+
+    benchmark(args.records, args.concurrency, args.rate or None, args.latency, args.capacity, args.failure_rate)
+
+
+if __name__ == "__main__":
+    main()
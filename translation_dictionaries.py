@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+翻译词典的唯一来源与预编译产物
+
+所有翻译词典都保存在 translations.json 中（按名称区分，例如read_2024_databases.py
+和read_2024_sup_databases.py共用'extended'）。脚本不再内嵌几百行的词典字面量，
+第一次翻译时才加载：读取 .nar_cache/ 下预编译好的二进制产物（pickle，
+含每个词典的短语字典树），产物不存在或与translations.json不一致时自动重新编译。
+
+编译（build 命令和自动重新编译都一样）前会检查：
+  - translations.json 中同一词典里没有重复的英文条目；
+  - 仓库里的脚本没有再出现与translations.json不一致的词典副本；
+不通过时不生成产物：build 命令以非零状态退出，自动重新编译时抛出DictionaryError。
+不同词典对同一短语给出不同译法只作提示。
+
+用法:
+    python translation_dictionaries.py build     # 检查并生成预编译产物
+    python translation_dictionaries.py check     # 只检查
+"""
+import ast
+import glob
+import hashlib
+import json
+import os
+import pickle
+import sys
+
+from catalog_io import atomic_open
+from phrase_translator import CompiledTranslations
+
+SOURCE_FILE = 'translations.json'
+CACHE_DIR = '.nar_cache'
+# CompiledTranslations的结构变化时递增，使旧产物失效
+FORMAT_VERSION = 2
+
+# 脚本中曾经内嵌的词典变量 -> translations.json中的词典名称
+SCRIPT_DICTIONARIES = {
+    ('read_2024_databases.py', 'EXTENDED_TRANSLATIONS'): 'extended',
+    ('read_2024_sup_databases.py', 'EXTENDED_TRANSLATIONS'): 'extended',
+    ('read_2024_web_sites.py', 'EXTENDED_TRANSLATIONS'): 'extended_web_2024',
+    ('read_96_new_databases.py', 'EXTENDED_TRANSLATIONS'): 'extended_96',
+    ('add_missing_3d_gnome.py', 'EXTENDED_TRANSLATIONS'): 'extended_3d_gnome',
+    ('read_web_sites.py', 'WEB_TRANSLATIONS'): 'web',
+    ('read_supplementary.py', 'ADDITIONAL_TRANSLATIONS'): 'additional',
+    ('categorize_databases.py', 'TRANSLATIONS'): 'basic',
+}
+
+
+class DictionaryError(Exception):
+    """词典来源有问题（重复条目、副本不一致等）"""
+
+
+def _source_sha256(source_file):
+    with open(source_file, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def artifact_path(source_sha256):
+    return os.path.join(CACHE_DIR, f"translations-v{FORMAT_VERSION}-{source_sha256[:16]}.pkl")
+
+
+def _dictionary_version(translations):
+    """词典内容（含条目顺序）的哈希，内容不变时版本不变"""
+    content = json.dumps(list(translations.items()), ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+
+
+def read_source(source_file=SOURCE_FILE):
+    """读取translations.json；同一词典中出现重复条目时抛出DictionaryError"""
+    duplicates = []
+
+    def no_duplicates(pairs):
+        seen = {}
+        for key, value in pairs:
+            if key in seen:
+                duplicates.append(key)
+            seen[key] = value
+        return seen
+
+    with open(source_file, 'r', encoding='utf-8') as f:
+        dictionaries = json.load(f, object_pairs_hook=no_duplicates)
+    if duplicates:
+        raise DictionaryError(f"{source_file} 中有重复条目: {sorted(set(duplicates))}")
+    for name, translations in dictionaries.items():
+        bad = [eng for eng, chn in translations.items() if not eng or not isinstance(chn, str) or not chn]
+        if bad:
+            raise DictionaryError(f"词典 '{name}' 中有空的条目或译文: {bad}")
+    return dictionaries
+
+
+def find_script_copies(directory='.'):
+    """找出脚本中仍以字面量定义的词典副本：返回 [(文件, 变量名, 词典), ...]"""
+    names = {variable for _, variable in SCRIPT_DICTIONARIES}
+    copies = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.py'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        for node in tree.body:
+            if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict)
+                    and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                    and node.targets[0].id in names):
+                copies.append((os.path.basename(path), node.targets[0].id, ast.literal_eval(node.value)))
+    return copies
+
+
+def check(source_file=SOURCE_FILE, directory='.'):
+    """检查词典来源和脚本中的副本，不一致时抛出DictionaryError，返回全部词典"""
+    dictionaries = read_source(source_file)
+
+    diverged = []
+    for script, variable, translations in find_script_copies(directory):
+        name = SCRIPT_DICTIONARIES.get((script, variable))
+        canonical = dictionaries.get(name)
+        if canonical is None or list(canonical.items()) != list(translations.items()):
+            diverged.append(f"{script}: {variable}（应与{source_file}中的'{name}'一致）")
+    if diverged:
+        raise DictionaryError("脚本中的词典副本与唯一来源不一致:\n  " + "\n  ".join(diverged))
+
+    # 不同词典对同一短语的不同译法（各脚本的历史输出依赖于此，只提示）
+    translations_by_phrase = {}
+    for name, translations in dictionaries.items():
+        for eng, chn in translations.items():
+            translations_by_phrase.setdefault(eng, set()).add(chn)
+    conflicts = sorted(eng for eng, values in translations_by_phrase.items() if len(values) > 1)
+    if conflicts:
+        print(f"提示: {len(conflicts)} 个短语在不同词典中译法不同，例如 {conflicts[:5]}")
+    return dictionaries
+
+
+def build(source_file=SOURCE_FILE, dictionaries=None):
+    """
+    编译全部词典并原子写入预编译产物，返回产物路径
+
+    dictionaries 为已经通过check()的词典；省略时先运行check()（检查source_file
+    所在目录的脚本），不通过时抛出DictionaryError，不生成产物。
+    """
+    source_sha256 = _source_sha256(source_file)
+    if dictionaries is None:
+        dictionaries = check(source_file, os.path.dirname(source_file) or '.')
+    compiled = {name: CompiledTranslations(translations) for name, translations in dictionaries.items()}
+    versions = {name: _dictionary_version(translations) for name, translations in dictionaries.items()}
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = artifact_path(source_sha256)
+    with atomic_open(path, binary=True) as f:
+        f.write(pickle.dumps(
+            {'dictionaries': dictionaries, 'compiled': compiled, 'versions': versions},
+            protocol=pickle.HIGHEST_PROTOCOL
+        ))
+    # 删除旧版本的产物
+    for old_path in glob.glob(os.path.join(CACHE_DIR, 'translations-*.pkl')):
+        if old_path != path:
+            os.remove(old_path)
+    return path
+
+
+_loaded = None
+
+
+def _load(source_file=SOURCE_FILE):
+    """加载预编译产物（每个进程只加载一次），不存在或过期时重新编译"""
+    global _loaded
+    if _loaded is None:
+        path = artifact_path(_source_sha256(source_file))
+        if not os.path.exists(path):
+            build(source_file)
+        with open(path, 'rb') as f:
+            _loaded = pickle.load(f)
+    return _loaded
+
+
+def load_dictionary(name):
+    """返回名为name的词典（dict）"""
+    return _load()['dictionaries'][name]
+
+
+def compiled_dictionary(name):
+    """返回名为name的词典编译后的短语字典树"""
+    return _load()['compiled'][name]
+
+
+def dictionary_version(name):
+    """名为name的词典的版本（内容哈希），只有该词典变化时才会改变"""
+    return _load()['versions'][name]
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    if command not in ('build', 'check'):
+        print(f"未知命令: {command}（可用: build, check）")
+        sys.exit(1)
+    try:
+        dictionaries = check()
+    except DictionaryError as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+    print(f"{SOURCE_FILE}: {len(dictionaries)} 个词典，"
+          f"{sum(len(translations) for translations in dictionaries.values())} 个条目")
+    if command == 'build':
+        print(f"已生成 {build(dictionaries=dictionaries)}")
+
+
+if __name__ == "__main__":
+    main()
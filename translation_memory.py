@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+持久化的翻译记忆（SQLite）
+
+2024、2025年的工作簿之间，以及databases.json、databases_processed.json、
+bioinfo_resources_*.json等快照之间，大量short_description是重复的，
+原来每次运行都要重新翻译。这里把翻译结果按 (词典名称, 词典版本, 原文) 保存在
+.nar_cache/translation_memory.db 中：同一词典内容不变时直接取用，
+词典改动后版本（内容哈希，见translation_dictionaries.dictionary_version）随之变化，
+旧结果不再命中。
+
+记忆的条目数有上限，超出时按最近使用时间淘汰最久未用的条目。
+
+用法:
+    python translation_memory.py stats                          # 条目数与各词典版本
+    python translation_memory.py warm databases.json ...        # 用快照中的描述预热
+    python translation_memory.py clear                          # 清空翻译记忆
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+MEMORY_FILE = os.path.join('.nar_cache', 'translation_memory.db')
+# 条目数上限（约为现有全部工作簿和快照中不同描述数量的十几倍）
+MAX_ENTRIES = 200000
+# SQLite单条语句的参数个数有上限，批量查询按此分块
+QUERY_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory (
+    dictionary TEXT NOT NULL,
+    version TEXT NOT NULL,
+    source TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (dictionary, version, source)
+);
+CREATE INDEX IF NOT EXISTS idx_memory_last_used ON memory(last_used);
+"""
+
+
+class TranslationMemory:
+    """一个翻译记忆数据库，并统计本进程内的命中情况"""
+
+    def __init__(self, path=MEMORY_FILE, max_entries=MAX_ENTRIES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 并行导入时多个进程共用同一个数据库
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, dictionary, version, sources):
+        """批量查找，返回 {原文: 译文}，并更新命中条目的使用时间"""
+        found = {}
+        for offset in range(0, len(sources), QUERY_CHUNK):
+            chunk = sources[offset:offset + QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(self.conn.execute(
+                f"SELECT source, translation FROM memory "
+                f"WHERE dictionary = ? AND version = ? AND source IN ({placeholders})",
+                [dictionary, version] + chunk
+            ))
+        if found:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE memory SET last_used = ? WHERE dictionary = ? AND version = ? AND source = ?",
+                    [(now, dictionary, version, source) for source in found]
+                )
+        return found
+
+    def store(self, dictionary, version, translations):
+        """保存新的翻译结果 {原文: 译文}，超出上限时淘汰最久未用的条目"""
+        if not translations:
+            return
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO memory (dictionary, version, source, translation, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(dictionary, version, source, translation, now) for source, translation in translations.items()]
+            )
+            self.evict()
+
+    def evict(self):
+        """条目数超过上限时删除最久未用的条目，返回删除的条目数"""
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM memory").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        self.conn.execute(
+            "DELETE FROM memory WHERE rowid IN (SELECT rowid FROM memory ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+        return excess
+
+    def translate_many(self, texts, translate, dictionary, version=None):
+        """
+        批量翻译：已在记忆中的直接取用，只对未命中的文本调用translate(text)
+
+        dictionary 为translate使用的translations.json词典名称，
+        version 默认取该词典当前的版本。返回与texts顺序相同的译文列表。
+        """
+        if version is None:
+            from translation_dictionaries import dictionary_version
+            version = dictionary_version(dictionary)
+
+        # 记忆只保存字符串；'nan'等非字符串值每次直接计算
+        sources = list(dict.fromkeys(text for text in texts if isinstance(text, str)))
+        found = self.lookup(dictionary, version, sources)
+        computed = {source: translate(source) for source in sources if source not in found}
+        self.store(dictionary, version, {
+            source: translation for source, translation in computed.items() if isinstance(translation, str)
+        })
+
+        self.hits += len(found)
+        self.misses += len(computed)
+        found.update(computed)
+        return [found[text] if isinstance(text, str) else translate(text) for text in texts]
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def report(self):
+        """本进程内的命中统计"""
+        return format_report(self.hits, self.misses)
+
+    def stats(self):
+        """各词典版本的条目数 [(词典, 版本, 条目数), ...]"""
+        return self.conn.execute(
+            "SELECT dictionary, version, COUNT(*) FROM memory GROUP BY dictionary, version ORDER BY dictionary"
+        ).fetchall()
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM memory")
+
+
+_memories = {}
+
+
+def open_memory(path=MEMORY_FILE):
+    """返回路径对应的翻译记忆（每个进程每个路径只打开一次）"""
+    if path not in _memories:
+        _memories[path] = TranslationMemory(path)
+    return _memories[path]
+
+
+def translate_cached(texts, translate, dictionary):
+    """用默认的翻译记忆批量翻译，返回 (译文列表, 翻译记忆)"""
+    memory = open_memory()
+    return memory.translate_many(texts, translate, dictionary), memory
+
+
+def format_report(hits, misses):
+    """命中统计的输出格式"""
+    total = hits + misses
+    return (f"翻译记忆: {total} 条不同描述，命中 {hits} 条"
+            f"（{hits / total if total else 0.0:.1%}），新翻译 {misses} 条")
+
+
+def memory_counts(path=MEMORY_FILE):
+    """本进程内累计的 (命中数, 未命中数)；没有用过翻译记忆时为 (0, 0)"""
+    memory = _memories.get(path)
+    return (memory.hits, memory.misses) if memory is not None else (0, 0)
+
+
+def print_report(counts=None):
+    """
+    脚本结束时输出一次命中统计；counts 默认为本进程的memory_counts()
+
+    批量转换（nar_batch.records_from_frame）按块调用时不输出，统计累计到这里。
+    没有经过翻译记忆翻译时不输出。
+    """
+    hits, misses = counts if counts is not None else memory_counts()
+    if hits or misses:
+        print(format_report(hits, misses))
+
+
+# warm命令可用的词典及对应的翻译函数
+WARM_TRANSLATORS = {
+    'extended': ('read_2024_databases', 'translate_description'),
+    'extended_web_2024': ('read_2024_web_sites', 'translate_description'),
+    'web': ('read_web_sites', 'translate_description'),
+}
+
+
+def warm(paths, dictionary):
+    """用快照文件中的short_description预热翻译记忆"""
+    import importlib
+    module_name, function_name = WARM_TRANSLATORS[dictionary]
+    translate = getattr(importlib.import_module(module_name), function_name)
+
+    memory = open_memory()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        # 快照有两种格式：资源列表，或{'resources': [...]}
+        resources = data['resources'] if isinstance(data, dict) else data
+        descriptions = [resource.get('short_description', '') for resource in resources]
+        start = time.perf_counter()
+        memory.translate_many(descriptions, translate, dictionary)
+        print(f"{path}: {len(descriptions)} 条描述，用时 {(time.perf_counter() - start) * 1000:.0f} 毫秒")
+    print(memory.report())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='持久化的翻译记忆')
+    parser.add_argument('command', choices=['stats', 'warm', 'clear'])
+    parser.add_argument('files', nargs='*', help='warm命令使用的快照文件')
+    parser.add_argument('--dictionary', choices=sorted(WARM_TRANSLATORS), default='extended',
+                        help='warm命令使用的词典（默认: extended）')
+    args = parser.parse_args()
+
+    memory = open_memory()
+    if args.command == 'stats':
+        rows = memory.stats()
+        print(f"{MEMORY_FILE}: {sum(count for _, _, count in rows)} 条（上限 {memory.max_entries}）")
+        for dictionary, version, count in rows:
+            print(f"  {dictionary} @ {version}: {count} 条")
+    elif args.command == 'warm':
+        warm(args.files or ['databases_processed.json'], args.dictionary)
+    else:
+        memory.clear()
+        print(f"已清空 {MEMORY_FILE}")
+
+
+if __name__ == "__main__":
+    main()
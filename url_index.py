@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+URL规范化与主机索引
+
+工作簿中的URL按原样保存：有的带末尾的/，有的是http有的是https，缺失的是'nan'。
+去重、检查链接、按主机统计都要反复解析这些字符串。这里：
+
+  - 规范化阶段：新记录写入目录前（dedup_index.dedupe()）计算规范化URL，
+    保存在原url旁边的 url_canonical 字段中；'nan'等缺失值和不是URL的文本为None；
+  - UrlIndex：一次扫描建立 规范化URL -> 记录 和 主机 -> 记录 两个哈希索引，
+    优先使用记录中已保存的url_canonical，不再重新解析；
+  - 去重（dedup_index）、近似重复检测（near_duplicates）、链接检查和按主机统计
+    都通过索引查找完成。链接检查每个规范化URL只请求一次，同一主机的请求依次发送。
+
+规范化规则：http/https视为相同，忽略www.前缀、主机名大小写、默认端口、#片段和
+路径末尾的/；路径和查询参数保持原样。
+
+用法:
+    python url_index.py canonicalize            # 为目录中已有记录补上url_canonical
+    python url_index.py hosts --top 20          # 按主机统计
+    python url_index.py lookup https://www.ebi.ac.uk/
+    python url_index.py check-links --workers 16
+    python -m doctest url_index.py              # 检查canonical_url的示例
+"""
+import argparse
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from catalog_io import write_json_atomic
+
+CATALOG_FILE = 'databases_processed.json'
+CACHE_DIR = '.nar_cache'
+LINK_STATUS_FILE = os.path.join(CACHE_DIR, 'link_status.json')
+
+CANONICAL_FIELD = 'url_canonical'
+LINK_WORKERS = 16
+LINK_TIMEOUT = 10
+# 检查结果在这段时间内有效，不重复请求（天）
+LINK_MAX_AGE_DAYS = 7
+
+# 缺失值在工作簿中读出来是'nan'
+MISSING_VALUES = {'', 'nan', 'none', 'null', 'n/a'}
+_DEFAULT_PORTS = {'80', '443'}
+_USER_AGENT = 'Mozilla/5.0 (compatible; bioinfo123-link-check)'
+
+
+def canonical_url(url):
+    """
+    规范化URL，返回用于比较的字符串；没有URL或不是URL时返回None
+
+    http/https视为相同，忽略www.前缀、主机名大小写、默认端口、#片段和路径末尾的/。
+    端口不是数字或超出范围等无法解析的URL也返回None。
+
+    >>> canonical_url('HTTPS://www.Example.org:443/db/#top')
+    'example.org/db'
+    >>> canonical_url('http://foo.org:8080/')
+    'foo.org:8080'
+    >>> canonical_url('http://foo.org:abc') is None
+    True
+    >>> canonical_url('http://foo.org:99999') is None
+    True
+    >>> canonical_url('http://[::1') is None
+    True
+    """
+    if url is None:
+        return None
+    text = str(url).strip()
+    if text.lower() in MISSING_VALUES or ' ' in text:
+        return None
+    if '://' not in text:
+        text = 'http://' + text
+    try:
+        parts = urlsplit(text)
+        port = parts.port
+    except ValueError:
+        return None
+    host = (parts.hostname or '').lower()
+    if not host or '.' not in host:
+        return None
+    if host.startswith('www.'):
+        host = host[4:]
+    if port is not None and str(port) in _DEFAULT_PORTS:
+        port = None
+    canonical = host + (f':{port}' if port else '') + parts.path.rstrip('/')
+    if parts.query:
+        canonical += '?' + parts.query
+    return canonical
+
+
+def url_host(canonical):
+    """规范化URL中的主机名（含端口）"""
+    return canonical.split('/')[0].split('?')[0] if canonical else None
+
+
+def record_url(record):
+    """记录的规范化URL：优先使用已保存的url_canonical"""
+    if CANONICAL_FIELD in record:
+        return record[CANONICAL_FIELD]
+    return canonical_url(record.get('url'))
+
+
+def canonicalize_record(record):
+    """
+    计算并保存记录的url_canonical（放在url字段后面），返回规范化URL
+
+    url_canonical已经与url一致时不修改记录。
+    """
+    canonical = canonical_url(record.get('url'))
+    if CANONICAL_FIELD in record and record[CANONICAL_FIELD] == canonical:
+        return canonical
+    items = [(field, value) for field, value in record.items() if field != CANONICAL_FIELD]
+    record.clear()
+    for field, value in items:
+        record[field] = value
+        if field == 'url':
+            record[CANONICAL_FIELD] = canonical
+    record.setdefault(CANONICAL_FIELD, canonical)
+    return canonical
+
+
+def canonicalize_records(records):
+    """规范化一批记录，返回url_canonical有变化的记录数"""
+    changed = 0
+    for record in records:
+        stored = CANONICAL_FIELD in record
+        before = record.get(CANONICAL_FIELD)
+        if canonicalize_record(record) != before or not stored:
+            changed += 1
+    return changed
+
+
+class UrlIndex:
+    """规范化URL -> 记录 和 主机 -> 记录 的哈希索引"""
+
+    def __init__(self, records=()):
+        self.by_url = {}
+        self.by_host = {}
+        self.missing = 0
+        for record in records:
+            self.add(record)
+
+    def add(self, record):
+        canonical = record_url(record)
+        if canonical is None:
+            self.missing += 1
+            return
+        self.by_url.setdefault(canonical, []).append(record)
+        self.by_host.setdefault(url_host(canonical), []).append(record)
+
+    def find_url(self, url):
+        """与url规范化后相同的记录"""
+        return self.by_url.get(canonical_url(url), [])
+
+    def find_host(self, host):
+        """主机上的全部记录（host可以是URL或主机名）"""
+        return self.by_host.get(url_host(canonical_url(host)), [])
+
+    def urls_by_host(self):
+        """{主机: [规范化URL, ...]}"""
+        hosts = {}
+        for canonical in self.by_url:
+            hosts.setdefault(url_host(canonical), []).append(canonical)
+        return hosts
+
+    def host_stats(self):
+        """按资源数从多到少：[(主机, 资源数, 不同URL数), ...]"""
+        urls = self.urls_by_host()
+        stats = [(host, len(records), len(urls[host])) for host, records in self.by_host.items()]
+        return sorted(stats, key=lambda item: (-item[1], item[0]))
+
+    def duplicate_urls(self):
+        """多条记录共用的规范化URL：{规范化URL: [记录, ...]}"""
+        return {canonical: records for canonical, records in self.by_url.items() if len(records) > 1}
+
+
+def _is_catalog(catalog_file):
+    return os.path.realpath(catalog_file) == os.path.realpath(CATALOG_FILE)
+
+
+def _load_snapshot(catalog_file):
+    """返回 (原始数据, 记录列表)；databases_processed.json经过操作日志读取（原始数据为None）"""
+    if _is_catalog(catalog_file):
+        from catalog_journal import load_catalog
+        return None, load_catalog(catalog_file)
+    with open(catalog_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data, (data['resources'] if isinstance(data, dict) else data)
+
+
+def _load_records(catalog_file):
+    return _load_snapshot(catalog_file)[1]
+
+
+def canonicalize_catalog(catalog_file=CATALOG_FILE, dry_run=False):
+    """为目录中已有的记录补上（或更新）url_canonical，返回修改的记录数"""
+    data, records = _load_snapshot(catalog_file)
+    changed = canonicalize_records(records)
+    missing = sum(record[CANONICAL_FIELD] is None for record in records)
+    print(f"{catalog_file}: {len(records)} 条记录，{changed} 条需要写入url_canonical，{missing} 条没有有效URL")
+    if dry_run or not changed:
+        return changed
+    if data is None:
+        # 按ID的日志操作无法区分重复ID的记录，整体重写目录
+        from catalog_journal import write_catalog
+        write_catalog(records, catalog_file)
+    else:
+        # 其它快照直接改写文件，保持原来的结构
+        write_json_atomic(catalog_file, data, pretty=True)
+    print(f"已写入 {catalog_file}")
+    return changed
+
+
+def load_link_status(status_file=LINK_STATUS_FILE):
+    if not os.path.exists(status_file):
+        return {}
+    with open(status_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_url(url, timeout=LINK_TIMEOUT):
+    """请求一个URL，返回 (HTTP状态码或None, 错误信息)；HEAD不被支持时改用GET"""
+    if '://' not in url:
+        url = 'http://' + url
+    for method in ('HEAD', 'GET'):
+        request = urllib.request.Request(url, method=method, headers={'User-Agent': _USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return response.status, None
+        except urllib.error.HTTPError as e:
+            if method == 'HEAD' and e.code in (403, 405, 501):
+                continue
+            return e.code, None
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return None, str(getattr(e, 'reason', e))
+    return None, 'unreachable'
+
+
+def _check_host(urls, timeout):
+    """依次检查同一主机上的URL，返回 {规范化URL: (状态码, 错误)}"""
+    return {canonical: check_url(url, timeout) for canonical, url in urls}
+
+
+def check_links(index, status_file=LINK_STATUS_FILE, workers=LINK_WORKERS, timeout=LINK_TIMEOUT,
+                max_age_days=LINK_MAX_AGE_DAYS):
+    """
+    检查索引中每个规范化URL（每个只请求一次），返回 {规范化URL: 检查结果}
+
+    不同主机并发检查，同一主机的URL依次请求；max_age_days天内检查过的URL不再请求。
+    结果保存在status_file中。
+    """
+    status = load_link_status(status_file)
+    cutoff = time.time() - max_age_days * 86400
+    pending = {}
+    for host, canonicals in index.urls_by_host().items():
+        stale = [canonical for canonical in canonicals
+                 if status.get(canonical, {}).get('checked_at', 0) < cutoff]
+        if stale:
+            # 用第一条记录中原样的URL请求（保留http/https）
+            pending[host] = [(canonical, index.by_url[canonical][0].get('url')) for canonical in stale]
+
+    total = sum(len(urls) for urls in pending.values())
+    print(f"需要检查 {total} 个URL（{len(pending)} 个主机），"
+          f"{len(index.by_url) - total} 个在 {max_age_days} 天内已检查过")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(lambda urls: _check_host(urls, timeout), pending.values()):
+            for canonical, (code, error) in results.items():
+                status[canonical] = {'status': code, 'error': error, 'checked_at': time.time()}
+    if total:
+        print(f"检查完成，用时 {time.perf_counter() - start:.1f} 秒")
+        os.makedirs(os.path.dirname(status_file) or '.', exist_ok=True)
+        write_json_atomic(status_file, status, pretty=True)
+    return {canonical: status[canonical] for canonical in index.by_url if canonical in status}
+
+
+def is_broken(result):
+    return result['status'] is None or result['status'] >= 400
+
+
+def report_links(index, results):
+    broken = {canonical: result for canonical, result in results.items() if is_broken(result)}
+    print(f"{len(results)} 个URL中 {len(broken)} 个无法访问")
+    for canonical, result in sorted(broken.items()):
+        names = ', '.join(str(record.get('name')) for record in index.by_url[canonical])
+        print(f"  {canonical}: {result['status'] or result['error']}（{names}）")
+    return broken
+
+
+def main():
+    parser = argparse.ArgumentParser(description='URL规范化与主机索引')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    canonicalize_parser = subparsers.add_parser('canonicalize', help='为目录中已有记录补上url_canonical')
+    canonicalize_parser.add_argument('--dry-run', action='store_true', help='只统计，不写入')
+    hosts_parser = subparsers.add_parser('hosts', help='按主机统计资源')
+    hosts_parser.add_argument('--top', type=int, default=20)
+    lookup_parser = subparsers.add_parser('lookup', help='查找URL或主机上的资源')
+    lookup_parser.add_argument('url')
+    links_parser = subparsers.add_parser('check-links', help='检查链接是否可以访问')
+    links_parser.add_argument('--workers', type=int, default=LINK_WORKERS, help='同时检查的主机数')
+    links_parser.add_argument('--timeout', type=float, default=LINK_TIMEOUT)
+    links_parser.add_argument('--max-age', type=float, default=LINK_MAX_AGE_DAYS,
+                              help='多少天内检查过的URL不再请求（0表示全部重新检查）')
+    for subparser in (canonicalize_parser, hosts_parser, lookup_parser, links_parser):
+        subparser.add_argument('--catalog', default=CATALOG_FILE, help='目录文件')
+    args = parser.parse_args()
+
+    if args.command == 'canonicalize':
+        canonicalize_catalog(args.catalog, args.dry_run)
+        return
+
+    records = _load_records(args.catalog)
+    index = UrlIndex(records)
+    if args.command == 'hosts':
+        stats = index.host_stats()
+        print(f"{args.catalog}: {len(records)} 条记录，{len(index.by_url)} 个不同URL，"
+              f"{len(stats)} 个主机，{index.missing} 条没有有效URL")
+        for host, resources, urls in stats[:args.top]:
+            print(f"  {host}: {resources} 条资源，{urls} 个不同URL")
+        duplicates = index.duplicate_urls()
+        print(f"多条记录共用的URL: {len(duplicates)} 个")
+    elif args.command == 'lookup':
+        same_url, same_host = index.find_url(args.url), index.find_host(args.url)
+        print(f"规范化URL: {canonical_url(args.url)}")
+        print(f"URL相同的资源: {len(same_url)} 条")
+        for record in same_url:
+            print(f"  [{record.get('id')}] {record.get('name')} ({record.get('source_file')})")
+        print(f"同一主机的资源: {len(same_host)} 条")
+        for record in same_host[:20]:
+            print(f"  [{record.get('id')}] {record.get('name')}: {record.get('url')}")
+    else:
+        results = check_links(index, workers=args.workers, timeout=args.timeout, max_age_days=args.max_age)
+        report_links(index, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工作簿的列式缓存（Arrow IPC格式）
+
+每个xlsx只解析一次，结果按内容哈希保存为 .nar_cache/<文件名>-<哈希>.arrow，
+之后的读取直接内存映射缓存文件，比重新解析xlsx快一到两个数量级。
+nar_ingest中的读取函数都会先经过这里；没有安装pyarrow时返回None，
+调用方退回到直接解析xlsx。
+"""
+import bisect
+import json
+import os
+import sys
+
+from nar_ingest import MISSING_VALUE, NAR_COLUMNS, iter_workbook_rows, read_workbook_header
+from workbook_manifest import file_sha256
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow是可选依赖
+    pa = None
+
+CACHE_DIR = '.nar_cache'
+# 缓存内容的格式版本，读取规则改变时递增（2：保留工作表中间的空行）
+CACHE_VERSION = 2
+
+# 进程内已经打开的缓存表：(工作簿路径, 工作表, 缓存目录) -> ((修改时间, 大小), 表)，
+# 同一个工作簿在一次运行中只映射一次，文件没变时不重新计算哈希
+_loaded_tables = {}
+
+
+def cache_available():
+    """是否可以使用列式缓存"""
+    return pa is not None
+
+
+def cache_path(path, sha256, sheet=None, cache_dir=CACHE_DIR):
+    """缓存文件路径：文件名 + 工作表 + 内容哈希 + 格式版本"""
+    file_name = os.path.basename(path)
+    sheet_part = f'-{sheet}' if sheet else ''
+    return os.path.join(cache_dir, f'{file_name}{sheet_part}-{sha256[:16]}-v{CACHE_VERSION}.arrow')
+
+
+def _remove_stale(path, current, sheet=None, cache_dir=CACHE_DIR):
+    """删除同一工作簿旧版本的缓存文件"""
+    prefix = os.path.basename(path) + (f'-{sheet}' if sheet else '') + '-'
+    for file_name in os.listdir(cache_dir):
+        candidate = os.path.join(cache_dir, file_name)
+        if file_name.startswith(prefix) and file_name.endswith('.arrow') and candidate != current:
+            os.remove(candidate)
+
+
+def build_cache(path, target, sheet=None):
+    """解析工作簿并写入Arrow缓存文件"""
+    header = read_workbook_header(path, sheet)
+    columns = ['excel_row'] + header + [column for column in NAR_COLUMNS if column not in header]
+    data = {column: [] for column in columns}
+    for row in iter_workbook_rows(path, sheet):
+        for column in columns:
+            data[column].append(row.get(column, MISSING_VALUE))
+
+    fields = [pa.field('excel_row', pa.int64())] + [pa.field(column, pa.string()) for column in columns[1:]]
+    schema = pa.schema(fields, metadata={b'header': json.dumps(header, ensure_ascii=False).encode('utf-8')})
+    table = pa.Table.from_pydict(data, schema=schema)
+
+    cache_dir = os.path.dirname(target)
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = target + '.tmp'
+    with pa.OSFile(temp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(table)
+    os.replace(temp_path, target)
+    _remove_stale(path, target, sheet, cache_dir)
+
+
+def _file_stat(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def loaded_table(path, sheet=None, cache_dir=CACHE_DIR):
+    """本进程中已经打开、且工作簿之后没有变化的缓存表，没有时返回None"""
+    entry = _loaded_tables.get((os.path.abspath(path), sheet, cache_dir))
+    if entry is not None and entry[0] == _file_stat(path):
+        return entry[1]
+    return None
+
+
+def load_cached_table(path, sheet=None, cache_dir=CACHE_DIR):
+    """
+    返回工作簿的Arrow表（内存映射），缓存不存在时先生成
+
+    本进程已经打开过、且修改时间和大小没变的工作簿直接返回，不计算哈希。
+    没有安装pyarrow时返回None。
+    """
+    if pa is None:
+        return None
+
+    table = loaded_table(path, sheet, cache_dir)
+    if table is not None:
+        return table
+
+    stat = _file_stat(path)
+    target = cache_path(path, file_sha256(path), sheet, cache_dir)
+    if not os.path.exists(target):
+        build_cache(path, target, sheet)
+
+    # 内存映射读取，列数据不会被复制到Python堆上
+    table = pa.ipc.open_file(pa.memory_map(target, 'r')).read_all()
+
+    _loaded_tables[(os.path.abspath(path), sheet, cache_dir)] = (stat, table)
+    return table
+
+
+def table_header(table):
+    """从缓存表的元数据中取出原始表头"""
+    return json.loads(table.schema.metadata[b'header'].decode('utf-8'))
+
+
+def iter_table_rows(table, first_row=None, last_row=None):
+    """按Excel行号范围逐行生成字典（excel_row列是递增的）"""
+    if first_row is not None or last_row is not None:
+        excel_rows = table.column('excel_row').to_numpy()
+        start = 0 if first_row is None else bisect.bisect_left(excel_rows, first_row)
+        stop = len(excel_rows) if last_row is None else bisect.bisect_right(excel_rows, last_row)
+        table = table.slice(start, max(stop - start, 0))
+
+    for batch in table.to_batches():
+        yield from batch.to_pylist()
+
+
+if __name__ == "__main__":
+    if pa is None:
+        print("未安装pyarrow，无法生成列式缓存")
+        sys.exit(1)
+    for workbook_path in sys.argv[1:]:
+        cached = load_cached_table(workbook_path)
+        print(f"{workbook_path}: {cached.num_rows}行 -> {cache_path(workbook_path, file_sha256(workbook_path))}")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工作簿内容哈希清单
+
+ingest_manifest.json 记录每个来源工作簿的SHA-256和它生成的记录。
+哈希未变化的工作簿不需要再解析、分类和翻译。
+"""
+import hashlib
+import json
+import os
+
+from catalog_io import write_json_atomic
+
+MANIFEST_FILE = 'ingest_manifest.json'
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """分块计算文件的SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    """读取清单，不存在时返回空清单"""
+    if not os.path.exists(manifest_file):
+        return {}
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, manifest_file=MANIFEST_FILE):
+    """保存清单"""
+    write_json_atomic(manifest_file, manifest)
+
+
+def manifest_entry(manifest, path):
+    """返回工作簿对应的清单条目（以文件名为键）"""
+    return manifest.get(os.path.basename(path))
+
+
+def is_unchanged(manifest, path, sha256, profile=None):
+    """工作簿内容（以及处理方式）与清单记录一致时返回True"""
+    entry = manifest_entry(manifest, path)
+    if entry is None or entry.get('sha256') != sha256:
+        return False
+    if profile is not None and entry.get('profile') != list(profile):
+        return False
+    return True
+
+
+def update_entry(manifest, path, sha256, records, profile=None):
+    """记录工作簿的哈希和它生成的记录"""
+    entry = {
+        'sha256': sha256,
+        'record_count': len(records),
+        'records': records,
+    }
+    if profile is not None:
+        entry['profile'] = list(profile)
+    manifest[os.path.basename(path)] = entry
+    return entry